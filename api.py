@@ -0,0 +1,206 @@
+from pathlib import Path
+import argparse
+import contextlib
+import json
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+import uvicorn
+
+from catalog import CatalogStore
+from queries import (
+    batch_lookup,
+    build_model_options,
+    fuzzy_codes,
+    ranked_code,
+    ranked_description,
+    ranked_product,
+    records_at,
+)
+
+
+# =============================
+# CONFIG
+# =============================
+
+DEFAULT_PORT = 8600
+# จำกัดจำนวนรหัสต่อ request ของ /api/batch
+MAX_BATCH = 5000
+# จำนวนแถวที่คืนจาก /api/parts และ /api/search (เรียงตามความเกี่ยวข้อง) ปรับได้ด้วย limit=
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+
+
+class UnicodeJSONResponse(JSONResponse):
+    """JSON ที่ไม่ escape ภาษาไทย/จีน (อ่านง่ายและเล็กกว่า \\uXXXX)"""
+
+    def render(self, content) -> bytes:
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# =============================
+# HANDLERS
+# =============================
+# handler เป็น def ธรรมดา (ไม่ใช่ async) Starlette จะรันใน thread pool ให้
+# งานค้นหาเป็น CPU ล้วน จึงไม่บล็อก event loop ที่รับ connection อยู่
+# (batch ต้อง await body จึงเป็น async แต่ส่งงานค้นเข้า thread pool เอง)
+
+def _store(request: Request) -> CatalogStore:
+    return request.app.state.store
+
+
+def _required(request: Request, name: str) -> str:
+    value = request.query_params.get(name, "").strip()
+    if not value:
+        raise HTTPException(400, detail=f"ต้องระบุ {name}")
+    return value
+
+
+def health(request: Request):
+    catalog = _store(request).current()
+    return UnicodeJSONResponse({"version": catalog.version[:16], "rows": len(catalog)})
+
+
+def _limit(request: Request) -> int:
+    raw = request.query_params.get("limit", "")
+    if not raw:
+        return DEFAULT_LIMIT
+    try:
+        limit = int(raw)
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= MAX_LIMIT:
+        raise HTTPException(400, detail=f"limit ต้องเป็นจำนวนเต็ม 1-{MAX_LIMIT}")
+    return limit
+
+
+def parts(request: Request):
+    """GET /api/parts?code=KD236-1179&exact=1&limit=50
+
+    count = จำนวนที่พบทั้งหมด parts = limit แถวแรกตามความเกี่ยวข้อง (เหมือนการ์ดในแอป)
+    ไม่พบเลยจะแนบ suggestions = รหัสที่ใกล้เคียง (พิมพ์ผิด) มาให้ ปิดได้ด้วย fuzzy=0
+    """
+    code = _required(request, "code")
+    exact = request.query_params.get("exact", "1") not in ("0", "false", "no")
+    fuzzy = request.query_params.get("fuzzy", "1") not in ("0", "false", "no")
+    limit = _limit(request)
+
+    catalog = _store(request).current()
+    result = ranked_code(catalog, code, exact=exact)
+    rows = records_at(catalog, result.top(limit))
+    body = {"code": code, "exact": exact, "count": len(result), "parts": rows}
+    if not rows and fuzzy:
+        body["suggestions"] = fuzzy_codes(catalog, code)
+    return UnicodeJSONResponse(body)
+
+
+def models(request: Request):
+    """GET /api/models?q=x70&category=Smart -> รายการ Model สำหรับ dropdown"""
+    options = build_model_options(
+        _store(request).current(),
+        keyword=request.query_params.get("q", "").strip(),
+        category=request.query_params.get("category") or None,
+    )
+    return UnicodeJSONResponse({
+        "count": len(options),
+        "models": [{"label": label, "model": model} for label, model in options],
+    })
+
+
+def model_parts(request: Request):
+    """GET /api/model-parts?model=J11022-1/31K-TH11 (ชื่อรุ่นมี / จึงส่งเป็น query)"""
+    model = _required(request, "model")
+    catalog = _store(request).current()
+    rows = records_at(catalog, catalog.model_rows(model))
+    return UnicodeJSONResponse({"model": model, "count": len(rows), "parts": rows})
+
+
+def search(request: Request):
+    """GET /api/search?q=toilet&limit=50 -> ค้นจาก Model / Product Name / CN Product Name
+
+    scope=description ค้นจากคำอธิบายอะไหล่ TH / EN / CN แทน (เช่น q=ไส้กรอง หรือ q=阀芯)
+    count = จำนวนที่พบทั้งหมด parts = limit แถวแรกตามความเกี่ยวข้อง
+    """
+    query = _required(request, "q")
+    scope = request.query_params.get("scope", "product")
+    limit = _limit(request)
+    catalog = _store(request).current()
+    if scope == "description":
+        result = ranked_description(catalog, query)
+    elif scope == "product":
+        result = ranked_product(catalog, query)
+    else:
+        raise HTTPException(400, detail="scope ต้องเป็น product หรือ description")
+    rows = records_at(catalog, result.top(limit))
+    return UnicodeJSONResponse({"q": query, "scope": scope, "count": len(result), "parts": rows})
+
+
+async def batch(request: Request):
+    """POST /api/batch {"codes": ["KD236-1179", ...]}"""
+    try:
+        codes = json.loads(await request.body() or b"{}").get("codes")
+    except (ValueError, AttributeError):
+        codes = None
+    if not isinstance(codes, list):
+        raise HTTPException(400, detail='body ต้องเป็น {"codes": [...]}')
+    if len(codes) > MAX_BATCH:
+        raise HTTPException(413, detail=f"ส่งได้ไม่เกิน {MAX_BATCH} รหัสต่อครั้ง")
+    # รับเฉพาะข้อความหรือจำนวนเต็ม (รหัสที่เป็นตัวเลขล้วน) ไม่แปลง null / true / {...} เป็นข้อความ
+    bad = next((i for i, c in enumerate(codes) if type(c) not in (str, int)), None)
+    if bad is not None:
+        raise HTTPException(400, detail=f"codes[{bad}] ต้องเป็นข้อความหรือจำนวนเต็ม")
+
+    return await run_in_threadpool(_batch_response, _store(request), [str(c) for c in codes])
+
+
+def _batch_response(store: CatalogStore, codes: list[str]) -> UnicodeJSONResponse:
+    # store.current() อาจต้องโหลด catalog และ JSON ของผลใหญ่ ทำใน thread pool ทั้งหมด
+    results = batch_lookup(store.current(), codes)
+    found = sum(r["found"] for r in results)
+    return UnicodeJSONResponse({"count": len(results), "found": found, "results": results})
+
+
+async def http_error(request: Request, exc: HTTPException):
+    return UnicodeJSONResponse({"error": exc.detail}, status_code=exc.status_code)
+
+
+def make_app(store: CatalogStore) -> Starlette:
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette):
+        store.current()  # โหลด catalog ก่อนเปิดรับ request
+        store.start_watcher()
+        yield
+
+    app = Starlette(
+        routes=[
+            Route("/api/health", health),
+            Route("/api/parts", parts),
+            Route("/api/models", models),
+            Route("/api/model-parts", model_parts),
+            Route("/api/search", search),
+            Route("/api/batch", batch, methods=["POST"]),
+        ],
+        exception_handlers={HTTPException: http_error},
+        lifespan=lifespan,
+    )
+    app.state.store = store
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/JSON API สำหรับค้นหาอะไหล่ (ใช้ข้อมูลชุดเดียวกับแอป)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    app = make_app(CatalogStore(Path(__file__).parent))
+    print(f"API พร้อมใช้งานที่ http://{args.host}:{args.port}/api/health")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,700 +1,840 @@
-from pathlib import Path
-import pandas as pd
-import streamlit as st
-
-
-# =============================
-# CONFIG
-# =============================
-
-COMBINE_FILE = "Spare parts list for TOA- Combine_DATA.xlsx"
-CN_FILE = "TOA main spare parts recommendation DATA.xlsx"
-
-
-# =============================
-# LOAD & MERGE DATA
-# =============================
-
-@st.cache_data
-def load_data():
-    base = Path(__file__).parent
-    combine_path = base / COMBINE_FILE
-    cn_path = base / CN_FILE
-
-    xls = pd.ExcelFile(combine_path, engine="openpyxl")
-    all_parts = []
-
-    for sheet in xls.sheet_names:
-        df = pd.read_excel(combine_path, sheet_name=sheet, engine="openpyxl")
-
-        if df.empty:
-            continue
-
-        df = df.dropna(how="all")
-        df = df.loc[:, ~df.columns.isna()]
-        df = df.loc[:, ~df.columns.duplicated()]
-
-        df.insert(0, "Category", sheet)
-
-        rename_map = {
-            "Spare part code": "Spare Part Code",
-            "Spare part code ": "Spare Part Code",
-            "Spare Part code": "Spare Part Code",
-            "Spare part Code": "Spare Part Code",
-            "Description": "Description (EN)",
-            "Description（Thai）": "Description (TH)",
-            "Description(Thai)": "Description (TH)",
-            "Description （Thai）": "Description (TH)",
-            "Description（Chinese）": "Description (CN)",
-            "Description(Chinese)": "Description (CN)",
-            "Description （Chinese）": "Description (CN)",
-            "Picture（Product）": "Product Image",
-            "Picture( Product )": "Product Image",
-            "Picture （Product）": "Product Image",
-            "Picture\n（Spare part）": "Spare Image",
-            "Picture( Spare part )": "Spare Image",
-            "Picture （Spare part）": "Spare Image",
-            "Waranty": "Warranty Type",
-            "Warranty": "Warranty Type",
-            "Unit Price\n(CNY)": "Unit Price (CNY)",
-            "Unit Price (CNY)": "Unit Price (CNY)",
-            "Spare parts quantity": "Spare Parts Qty",
-        }
-        df.rename(
-            columns={k: v for k, v in rename_map.items() if k in df.columns},
-            inplace=True,
-        )
-
-        if "Model" in df.columns:
-            df["Model"] = df["Model"].ffill()
-        if "Product Name" in df.columns:
-            df["Product Name"] = df["Product Name"].ffill()
-
-        all_parts.append(df)
-
-    if not all_parts:
-        raise ValueError("ไม่พบข้อมูลในไฟล์ Combine_DATA.xlsx เลย")
-
-    parts = pd.concat(all_parts, ignore_index=True)
-    parts = parts.loc[:, ~parts.columns.duplicated()]
-
-    if "Spare Part Code" not in parts.columns:
-        raise KeyError(
-            "ไม่พบคอลัมน์ 'Spare Part Code' ในไฟล์ Combine_DATA.xlsx\n"
-            "กรุณาเปิดไฟล์แล้วเช็คว่าชื่อคอลัมน์เขียนว่า 'Spare Part Code' หรือเปล่า"
-        )
-
-    parts["Spare Part Code"] = parts["Spare Part Code"].astype(str).str.strip()
-    if "Model" not in parts.columns:
-        parts["Model"] = ""
-    if "Product Name" not in parts.columns:
-        parts["Product Name"] = ""
-
-    cn = pd.read_excel(cn_path, sheet_name="Sheet1", engine="openpyxl")
-
-    cn.rename(
-        columns={
-            "Product name": "CN Product Name",
-            "Spare part number": "Spare Part Code",
-            "Spare part name": "CN Spare Part Name",
-            "Recommended Quantity": "CN Recommended Qty",
-        },
-        inplace=True,
-    )
-
-    cn = cn.loc[:, ~cn.columns.duplicated()]
-
-    keep_cols = []
-    for col in [
-        "Model",
-        "Spare Part Code",
-        "CN Product Name",
-        "CN Spare Part Name",
-        "CN Recommended Qty",
-        "Remark",
-    ]:
-        if col in cn.columns:
-            keep_cols.append(col)
-
-    cn = cn[keep_cols]
-
-    if "Spare Part Code" in cn.columns:
-        cn["Spare Part Code"] = cn["Spare Part Code"].astype(str).str.strip()
-    if "Model" not in cn.columns:
-        cn["Model"] = ""
-
-    merged = parts.merge(
-        cn,
-        on=["Model", "Spare Part Code"],
-        how="left",
-        suffixes=("", "_CN"),
-    )
-
-    return merged
-
-
-# =============================
-# HELPER: MODEL OPTIONS WITH GROUPING
-# =============================
-
-def build_model_options(df: pd.DataFrame, keyword: str = "", category: str | None = None):
-    """สร้าง list dropdown: (label, model) filter ด้วย category + keyword"""
-    mdf = df.copy()
-
-    if category and category != "ทั้งหมด" and "Category" in mdf.columns:
-        mdf = mdf[mdf["Category"] == category]
-
-    if keyword:
-        kw = keyword.lower()
-        mask = pd.Series(False, index=mdf.index)
-        for col in ["Model", "Product Name", "CN Product Name"]:
-            if col in mdf.columns:
-                mask = mask | mdf[col].astype(str).str.lower().str.contains(kw)
-        mdf = mdf[mask]
-
-    if "Model" not in mdf.columns:
-        return []
-
-    subset_cols = [c for c in ["Model", "Product Name", "Category"] if c in mdf.columns]
-    models_df = (
-        mdf[subset_cols]
-        .astype(str)
-        .replace("nan", "")
-        .drop_duplicates()
-    )
-
-    options: list[tuple[str, str]] = []
-    for _, r in models_df.iterrows():
-        model = r.get("Model", "").strip()
-        if not model:
-            continue
-        pname = r.get("Product Name", "").strip()
-        cat = r.get("Category", "").strip()
-
-        parts = []
-        if cat:
-            parts.append(cat)
-        parts.append(model)
-        if pname:
-            parts.append(pname)
-        label = " | ".join(parts)
-        options.append((label, model))
-
-    options.sort(key=lambda x: x[0].lower())
-    return options
-
-
-# =============================
-# UI / APP
-# =============================
-
-def main():
-    st.set_page_config(
-        page_title="TOA | JOMOO After Sale Service",
-        layout="wide",
-    )
-
-    # ---------- GLOBAL CSS ----------
-    st.markdown(
-        """
-        <style>
-        :root {
-            --toa-navy: #071427;
-            --toa-blue: #1B4EA3;
-            --toa-gold: #C89A55;
-            --toa-bg: #F4F7FB;
-        }
-
-        header[data-testid="stHeader"] {display: none;}
-        [data-testid="stToolbar"] {display: none;}
-        .block-container {padding-top: 0.5rem;}
-
-        .stApp {
-            background: var(--toa-bg);
-            font-family: "Segoe UI", system-ui, -apple-system, BlinkMacSystemFont, sans-serif;
-        }
-
-        .hero {
-            width: 100%;
-            padding: 1.4rem 1.8rem;
-            border-radius: 18px;
-            background: radial-gradient(circle at top left, #213b72 0%, #050B14 60%);
-            color: #ffffff;
-            margin-bottom: 1.4rem;
-            display: flex;
-            flex-direction: column;
-            gap: 0.35rem;
-            box-shadow: 0 14px 40px rgba(0,0,0,0.25);
-        }
-        .hero-title {
-            font-size: 1.7rem;
-            font-weight: 800;
-            letter-spacing: 0.03em;
-        }
-        .hero-sub {
-            opacity: 0.9;
-            font-size: 0.95rem;
-            line-height: 1.5;
-        }
-
-        .search-panel {
-            padding: 0.9rem 1.1rem;
-            border-radius: 18px;
-            background: #0B1220;
-            color: #ffffff;
-            box-shadow: 0 14px 30px rgba(15,23,42,0.25);
-        }
-        .search-panel h4 {
-            margin-bottom: 0.4rem;
-        }
-
-        .card {
-            padding: 0.9rem 1.1rem;      /* กระชับลง */
-            border-radius: 18px;
-            border: 1px solid #E2E8F0;
-            box-shadow: 0 12px 28px rgba(15, 23, 42, 0.06);
-            margin-bottom: 1.0rem;       /* ระยะห่างการ์ดต่อการ์ด */
-            background-color: #ffffff;
-        }
-
-        .field-label {
-            font-weight: 600;
-            color: #4B5563;
-        }
-
-        .card h3, .card h4, .card h5 {
-            color: var(--toa-navy);
-        }
-
-        .stAlert.success {
-            background-color: #E0F2FE;
-            border-radius: 999px;
-        }
-        .stAlert.warning {
-            background-color: #FEF3C7;
-            border-radius: 999px;
-        }
-
-        .subheading {
-            font-size: 0.95rem;
-            color: #6B7280;
-            margin-bottom: 0.15rem;      /* เดิมเยอะกว่านี้ */
-        }
-
-        .card hr {
-            margin: 0.35rem 0 0.55rem 0;
-            border-color: #E5E7EB;
-        }
-
-        .stRadio > div[role="radiogroup"] {
-            gap: 0.25rem;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    # ---------- HERO ----------
-    st.markdown(
-        """
-        <div class="hero">
-            <div class="hero-title">TOA | JOMOO After Sale Service Teams</div>
-            <div class="hero-sub">
-                ศูนย์กลางข้อมูลอะไหล่สำหรับทีม After Sale Service ของ TOA / JOMOO
-                ค้นหาจากรหัสอะไหล่ หรือค้นจากรุ่นสินค้า (เช่น X70, TS3) เพื่อดูอะไหล่ทั้งหมดของรุ่นนั้น
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
-
-    # โหลดข้อมูล
-    df = load_data()
-
-    base = Path(__file__).parent
-    images_dir = base / "images"
-    product_dir = images_dir / "product"
-    spare_dir = images_dir / "spare"
-
-    # ---------- helper แสดง card ----------
-    def render_cards(rows: pd.DataFrame):
-        for _, row in rows.iterrows():
-            code = str(row.get("Spare Part Code", "") or "").strip()
-            model = str(row.get("Model", "") or "").strip()
-            pname = str(row.get("Product Name", "") or "").strip()
-
-            prod_src = None
-            spare_src = None
-
-            if code:
-                for p in [images_dir / f"{code}.png", spare_dir / f"{code}.png"]:
-                    if p.exists():
-                        spare_src = p.as_posix()
-                        break
-
-            if not spare_src:
-                for key in ["Spare Image", "Product Image"]:
-                    val = row.get(key, "")
-                    if isinstance(val, str) and val.strip():
-                        spare_src = val.strip()
-                        break
-
-            if model:
-                raw_model_path = product_dir / f"{model}.png"
-                safe_model = "".join(ch if ch.isalnum() else "_" for ch in model)
-                safe_model_path = product_dir / f"{safe_model}.png"
-
-                if raw_model_path.exists():
-                    prod_src = raw_model_path.as_posix()
-                elif safe_model_path.exists():
-                    prod_src = safe_model_path.as_posix()
-
-            if not prod_src and pname:
-                safe_name = "".join(ch if ch.isalnum() else "_" for ch in pname)
-                pname_path = product_dir / f"{safe_name}.png"
-                if pname_path.exists():
-                    prod_src = pname_path.as_posix()
-
-            if (
-                not prod_src
-                and isinstance(row.get("Product Image", ""), str)
-                and row["Product Image"].strip()
-            ):
-                prod_src = row["Product Image"].strip()
-
-            st.markdown('<div class="card">', unsafe_allow_html=True)
-            col_img, col_info = st.columns([1.5, 2.0])
-
-            with col_img:
-                col_prod, col_spare = st.columns(2)
-
-                with col_prod:
-                    if prod_src:
-                        st.image(
-                            prod_src,
-                            use_container_width=True,
-                            caption="Product image",
-                        )
-                    else:
-                        st.markdown("**🛁 Product image**")
-                        st.caption(
-                            "ถ้ามีรูปสินค้า ให้เซฟเป็น .png แล้ววางในโฟลเดอร์ "
-                            "`images/product/` เช่น `images/product/ModelName.png`"
-                        )
-
-                with col_spare:
-                    if spare_src:
-                        st.image(
-                            spare_src,
-                            use_container_width=True,
-                            caption="Spare part image",
-                        )
-                    else:
-                        st.markdown("**🔧 Spare part image**")
-                        st.caption(
-                            "ถ้ามีรูปอะไหล่ ให้เซฟเป็นไฟล์ .png ชื่อเดียวกับ Spare Part Code "
-                            "แล้ววางในโฟลเดอร์ `images/` หรือ `images/spare/`"
-                        )
-
-            with col_info:
-                st.markdown(f"### {code}")
-
-                sub_parts = []
-                if model:
-                    sub_parts.append(f"Model: {model}")
-                if pname:
-                    sub_parts.append(pname)
-                if sub_parts:
-                    st.markdown(
-                        f"<div class='subheading'>{' · '.join(sub_parts)}</div>",
-                        unsafe_allow_html=True,
-                    )
-
-                # --- Basic info ---
-                st.markdown("**ข้อมูลหลัก (Basic Info)**")
-                c1, c2 = st.columns(2)
-                with c1:
-                    st.markdown(
-                        f"<span class='field-label'>Category:</span> {row.get('Category', '')}",
-                        unsafe_allow_html=True,
-                    )
-                    st.markdown(
-                        f"<span class='field-label'>Model:</span> {model}",
-                        unsafe_allow_html=True,
-                    )
-                    st.markdown(
-                        f"<span class='field-label'>Warranty Type:</span> {row.get('Warranty Type', '')}",
-                        unsafe_allow_html=True,
-                    )
-                    st.markdown(
-                        f"<span class='field-label'>Warranty Period:</span> {row.get('Warranty Period', '')}",
-                        unsafe_allow_html=True,
-                    )
-
-                with c2:
-                    st.markdown(
-                        f"<span class='field-label'>Product Name:</span> {pname}",
-                        unsafe_allow_html=True,
-                    )
-                    st.markdown(
-                        f"<span class='field-label'>Unit Price (CNY):</span> {row.get('Unit Price (CNY)', '')}",
-                        unsafe_allow_html=True,
-                    )
-                    st.markdown(
-                        f"<span class='field-label'>Spare Parts Qty (from list):</span> {row.get('Spare Parts Qty', '')}",
-                        unsafe_allow_html=True,
-                    )
-                    st.markdown(
-                        f"<span class='field-label'>Remark:</span> {row.get('Remark', '')}",
-                        unsafe_allow_html=True,
-                    )
-
-                # เส้นคั่นแบบ margin สั้น
-                st.markdown(
-                    "<hr style='margin:0.35rem 0 0.55rem 0; border-color:#E5E7EB;'/>",
-                    unsafe_allow_html=True,
-                )
-
-                # --- Description ---
-                st.markdown("**คำอธิบาย / Description**")
-                th = row.get("Description (TH)", "")
-                en = row.get("Description (EN)", "")
-                cn_txt = row.get("Description (CN)", "")
-                if isinstance(th, str) and th.strip():
-                    st.markdown(
-                        f"<span class='field-label'>Thai:</span> {th}",
-                        unsafe_allow_html=True,
-                    )
-                if isinstance(en, str) and en.strip():
-                    st.markdown(
-                        f"<span class='field-label'>English:</span> {en}",
-                        unsafe_allow_html=True,
-                    )
-                if isinstance(cn_txt, str) and cn_txt.strip():
-                    st.markdown(
-                        f"<span class='field-label'>Chinese:</span> {cn_txt}",
-                        unsafe_allow_html=True,
-                    )
-
-                st.markdown(
-                    "<hr style='margin:0.35rem 0 0.55rem 0; border-color:#E5E7EB;'/>",
-                    unsafe_allow_html=True,
-                )
-
-                # --- China Recommendation ---
-                st.markdown("**China Recommendation**")
-                st.markdown(
-                    f"<span class='field-label'>CN Product Name:</span> {row.get('CN Product Name', '')}",
-                    unsafe_allow_html=True,
-                )
-                st.markdown(
-                    f"<span class='field-label'>CN Spare Part Name:</span> {row.get('CN Spare Part Name', '')}",
-                    unsafe_allow_html=True,
-                )
-                st.markdown(
-                    f"<span class='field-label'>CN Recommended Qty:</span> {row.get('CN Recommended Qty', '')}",
-                    unsafe_allow_html=True,
-                )
-
-            st.markdown("</div>", unsafe_allow_html=True)
-
-    # ---------- LAYOUT: ซ้าย (search) / ขวา (result) ----------
-    search_col, result_col = st.columns([0.9, 2.1])
-
-    result_df: pd.DataFrame | None = None
-    status_kind = "info"
-    status_text = ""
-
-    # ---------- SEARCH PANEL (LEFT) ----------
-    with search_col:
-        st.markdown('<div class="search-panel">', unsafe_allow_html=True)
-        st.markdown("#### 🔍 Search")
-
-        search_mode = st.radio(
-            "Search mode",
-            ("ค้นหาจาก Spare Part Code", "ค้นหาจาก Product / Model"),
-            label_visibility="visible",
-        )
-
-        if search_mode == "ค้นหาจาก Spare Part Code":
-            code_input = st.text_input(
-                "Spare Part Code", placeholder="เช่น KD236-1179"
-            ).strip()
-            exact_match = st.checkbox("ค้นหาแบบตรงตัว (Exact match)", value=True)
-
-            if not code_input:
-                status_kind = "info"
-                status_text = "พิมพ์ **Spare Part Code** ทางซ้ายเพื่อเริ่มค้นหา"
-            else:
-                if "Spare Part Code" not in df.columns:
-                    status_kind = "error"
-                    status_text = "ไม่พบคอลัมน์ 'Spare Part Code' ในข้อมูล"
-                else:
-                    if exact_match:
-                        mask = df["Spare Part Code"].str.lower() == code_input.lower()
-                    else:
-                        mask = df["Spare Part Code"].str.contains(
-                            code_input, case=False, na=False
-                        )
-
-                    result_df = df[mask]
-
-                    if result_df.empty:
-                        status_kind = "warning"
-                        status_text = f"ไม่พบอะไหล่ที่มีโค้ด: **{code_input}**"
-                        result_df = None
-                    else:
-                        status_kind = "success"
-                        status_text = f"พบ {len(result_df)} รายการสำหรับโค้ด: **{code_input}**"
-
-        else:
-            st.markdown("**เลือกวิธีค้นหา Product / Model**")
-            product_search_mode = st.radio(
-                "ค้นหาด้วย",
-                ("เลือกจาก Model dropdown", "พิมพ์คำค้น (Product / Model)"),
-                label_visibility="collapsed",
-            )
-
-            if product_search_mode == "เลือกจาก Model dropdown":
-                # หมวดหมู่
-                cat_list = ["ทั้งหมด"]
-                if "Category" in df.columns:
-                    cat_unique = (
-                        df["Category"]
-                        .astype(str)
-                        .str.strip()
-                        .replace("nan", "")
-                        .dropna()
-                        .unique()
-                    )
-                    cat_list += sorted(cat_unique)
-
-                category_selected = st.selectbox(
-                    "หมวดหมู่สินค้า", options=cat_list
-                )
-
-                keyword_filter = st.text_input(
-                    "ตัวกรองชื่อสั้นๆ (เช่น x70, ts3)",
-                    placeholder="พิมพ์คำบางส่วนในชื่อรุ่น / product",
-                ).strip()
-
-                options = build_model_options(
-                    df, keyword=keyword_filter, category=category_selected
-                )
-
-                if not options:
-                    status_kind = "info"
-                    status_text = (
-                        "ยังไม่พบ Model ที่ตรงกับเงื่อนไขที่เลือก\n"
-                        "ลองเปลี่ยนหมวดหมู่ หรือเคลียร์ตัวกรองชื่อสั้นดูก่อน"
-                    )
-                else:
-                    labels = ["— เลือก Model —"] + [opt[0] for opt in options]
-                    label_selected = st.selectbox("เลือก Model", options=labels)
-
-                    if label_selected == "— เลือก Model —":
-                        status_kind = "info"
-                        status_text = "เลือก Model ด้านบนเพื่อดูรายการอะไหล่ทั้งหมดของรุ่นนั้น"
-                    else:
-                        label_to_model = {lbl: mdl for lbl, mdl in options}
-                        model_selected = label_to_model[label_selected]
-
-                        mask = df["Model"].astype(str).str.strip() == model_selected
-                        tmp = df[mask].copy()
-
-                        if tmp.empty:
-                            status_kind = "warning"
-                            status_text = f"ไม่พบอะไหล่สำหรับ Model: **{model_selected}**"
-                        else:
-                            result_df = tmp
-                            status_kind = "success"
-                            status_text = (
-                                f"พบอะไหล่ {len(result_df)} รายการสำหรับ Model: "
-                                f"**{model_selected}**"
-                            )
-            else:
-                product_input = st.text_input(
-                    "Product / Model",
-                    placeholder="เช่น X70, TS3, ZD9640 หรือคำบางส่วนในชื่อรุ่น",
-                ).strip()
-
-                if not product_input:
-                    status_kind = "info"
-                    status_text = (
-                        "พิมพ์ชื่อรุ่น หรือคำในชื่อ Product / Model ด้านบน "
-                        "หรือเลือกจาก Model dropdown ก็ได้"
-                    )
-                else:
-                    mask = pd.Series(False, index=df.index)
-
-                    if "Model" in df.columns:
-                        mask = mask | df["Model"].astype(str).str.contains(
-                            product_input, case=False, na=False
-                        )
-                    if "Product Name" in df.columns:
-                        mask = mask | df["Product Name"].astype(str).str.contains(
-                            product_input, case=False, na=False
-                        )
-                    if "CN Product Name" in df.columns:
-                        mask = mask | df["CN Product Name"].astype(str).str.contains(
-                            product_input, case=False, na=False
-                        )
-
-                    tmp = df[mask].copy()
-
-                    if tmp.empty:
-                        status_kind = "warning"
-                        status_text = (
-                            f"ไม่พบ Product / Model ที่ตรงกับคำว่า: **{product_input}**"
-                        )
-                    else:
-                        result_df = tmp
-                        status_kind = "success"
-                        status_text = (
-                            f"พบอะไหล่ {len(result_df)} รายการสำหรับคำค้น: "
-                            f"**{product_input}**"
-                        )
-
-        st.markdown("</div>", unsafe_allow_html=True)
-
-    # ---------- RESULT PANEL (RIGHT) ----------
-    with result_col:
-        if status_text:
-            if status_kind == "info":
-                st.info(status_text)
-            elif status_kind == "warning":
-                st.warning(status_text)
-            elif status_kind == "error":
-                st.error(status_text)
-            elif status_kind == "success":
-                st.success(status_text)
-
-        if result_df is not None and not result_df.empty:
-            sort_cols = [c for c in ["Model", "Spare Part Code"] if c in result_df.columns]
-            if sort_cols:
-                result_df = result_df.sort_values(sort_cols)
-
-            summary_cols = [c for c in [
-                "Model",
-                "Product Name",
-                "Spare Part Code",
-                "Description (TH)",
-                "Description (EN)",
-                "Spare Parts Qty",
-            ] if c in result_df.columns]
-
-            if summary_cols:
-                st.markdown("**ภาพรวมอะไหล่ของรุ่นนี้ (Summary List)**")
-                st.dataframe(
-                    result_df[summary_cols].reset_index(drop=True),
-                    use_container_width=True,
-                    hide_index=True,
-                )
-
-            st.markdown("---")
-            st.markdown("**รายละเอียดแต่ละอะไหล่ (Detail View)**")
-            render_cards(result_df)
-
-
-if __name__ == "__main__":
-    main()
+from pathlib import Path
+import html
+
+import pandas as pd
+import streamlit as st
+
+from catalog import CatalogStore
+from image_index import ImageIndex
+from queries import (
+    BATCH_CHUNK,
+    BATCH_FOUND,
+    CODE_FILE_ERRORS,
+    batch_csv,
+    build_model_options,
+    RankedResult,
+    cached_result,
+    fuzzy_codes,
+    iter_batch_table,
+    iter_code_file,
+    parse_codes,
+    ranked_code,
+    ranked_description,
+    ranked_fuzzy,
+    ranked_model,
+    ranked_product,
+    suggest_codes,
+    suggest_products,
+)
+from search_index import IncrementalSearch, fuzzy_key, normalize_description, normalize_text
+
+
+# =============================
+# CONFIG
+# =============================
+
+# จำนวนการ์ดต่อหน้าใน Detail View (ตาราง Summary List ยังแสดงครบทุกแถว)
+CARDS_PER_PAGE = 10
+PAGE_SIZE_OPTIONS = (10, 20, 50)
+# ช่องค้นหาส่งค่าเองเมื่อหยุดพิมพ์นานเท่านี้ (ไม่ต้องกด Enter)
+LIVE_DEBOUNCE = "300ms"
+# ตารางผล batch แสดงบนหน้าเว็บไม่เกินนี้ (ไฟล์ดาวน์โหลดมีครบทุกแถว)
+BATCH_PREVIEW_ROWS = 2000
+
+
+# =============================
+# LOAD & MERGE DATA
+# =============================
+
+@st.cache_resource
+def get_catalog_store() -> CatalogStore:
+    """ตัวเก็บ catalog ของทั้ง process (ทุก session ใช้ object เดียวกัน ไม่ copy DataFrame)
+
+    อ่านจาก snapshot (Parquet) ถ้ามี ไม่งั้นค่อยอ่าน Excel ทั้งสองไฟล์ ดู catalog.py
+    แก้ไฟล์ Excel แล้วไม่ต้อง restart: watcher จะโหลดเฉพาะชีตที่เปลี่ยนแล้วสลับให้เอง
+    """
+    store = CatalogStore(Path(__file__).parent)
+    store.start_watcher()
+    return store
+
+
+@st.cache_resource
+def load_image_index() -> ImageIndex:
+    """dict ของรูปใน images/ ใช้ร่วมกันทุก session (สแกนใหม่เองเมื่อโฟลเดอร์เปลี่ยน)"""
+    return ImageIndex(Path(__file__).parent / "images")
+
+
+# =============================
+# HELPER: CARD HTML
+# =============================
+
+def _cell_html(value) -> str:
+    """แปลงค่าในตารางเป็น HTML ที่ escape แล้ว (NaN/None -> ว่าง, ขึ้นบรรทัดใหม่ -> <br>)"""
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    text = html.escape(str(value).strip())
+    return text.replace("\n", "<br>")
+
+
+def _field_html(label: str, value) -> str:
+    return f"<div><span class='field-label'>{label}:</span> {_cell_html(value)}</div>"
+
+
+def _price_text(row) -> str:
+    """ราคาเป็นตัวเลข ถ้าไม่มีราคาแสดงหมายเหตุแทน (เช่น "核算中")"""
+    price = row.get("Unit Price (CNY)")
+    if isinstance(price, (int, float)) and price == price:
+        return f"{price:,.2f}"
+    note = row.get("Price Note")
+    return "" if note is None or note != note else str(note)
+
+
+def card_info_html(row) -> str:
+    """ข้อมูลฝั่งขวาของการ์ด (Basic Info / Description / China Recommendation)
+    รวมเป็น HTML ก้อนเดียว ส่งเป็น st.markdown ครั้งเดียวต่อการ์ด
+
+    ห้ามมีบรรทัดว่างใน HTML (markdown จะตัด HTML block ตรงบรรทัดว่าง)
+    """
+    code = str(row.get("Spare Part Code", "") or "").strip()
+    model = str(row.get("Model", "") or "").strip()
+    pname = str(row.get("Product Name", "") or "").strip()
+
+    out = [f"<div class='card-info'><h3>{_cell_html(code)}</h3>"]
+
+    sub_parts = []
+    if model:
+        sub_parts.append(f"Model: {_cell_html(model)}")
+    if pname:
+        sub_parts.append(_cell_html(pname))
+    if sub_parts:
+        out.append(f"<div class='subheading'>{' · '.join(sub_parts)}</div>")
+
+    # --- Basic info ---
+    out.append("<p><strong>ข้อมูลหลัก (Basic Info)</strong></p><div class='field-grid'><div>")
+    out.append(_field_html("Category", row.get("Category", "")))
+    out.append(_field_html("Model", model))
+    out.append(_field_html("Warranty Type", row.get("Warranty Type", "")))
+    out.append(_field_html("Warranty Period", row.get("Warranty Period", "")))
+    out.append("</div><div>")
+    out.append(_field_html("Product Name", pname))
+    out.append(_field_html("Unit Price (CNY)", _price_text(row)))
+    out.append(_field_html("Spare Parts Qty (from list)", row.get("Spare Parts Qty", "")))
+    out.append(_field_html("Remark", row.get("Remark", "")))
+    out.append("</div></div><hr/>")
+
+    # --- Description ---
+    out.append("<p><strong>คำอธิบาย / Description</strong></p>")
+    for label, col in [
+        ("Thai", "Description (TH)"),
+        ("English", "Description (EN)"),
+        ("Chinese", "Description (CN)"),
+    ]:
+        val = row.get(col, "")
+        if isinstance(val, str) and val.strip():
+            out.append(_field_html(label, val))
+    out.append("<hr/>")
+
+    # --- China Recommendation ---
+    out.append("<p><strong>China Recommendation</strong></p>")
+    out.append(_field_html("CN Product Name", row.get("CN Product Name", "")))
+    out.append(_field_html("CN Spare Part Name", row.get("CN Spare Part Name", "")))
+    out.append(_field_html("CN Recommended Qty", row.get("CN Recommended Qty", "")))
+    out.append("</div>")
+
+    return "".join(out)
+
+
+# =============================
+# HELPER: CARDS
+# =============================
+
+def render_cards(rows: pd.DataFrame, image_index: ImageIndex):
+    """การ์ดรายละเอียดของแต่ละแถว (รูปสินค้า / รูปอะไหล่ + ข้อมูล) key ของการ์ดใช้ index ของแถว"""
+    for idx, row in rows.iterrows():
+        code = str(row.get("Spare Part Code", "") or "").strip()
+        model = str(row.get("Model", "") or "").strip()
+        pname = str(row.get("Product Name", "") or "").strip()
+
+        spare_src = image_index.spare(code)
+        prod_src = image_index.product(model, pname)
+
+        if not spare_src:
+            for key in ["Spare Image", "Product Image"]:
+                val = row.get(key, "")
+                if isinstance(val, str) and val.strip():
+                    spare_src = val.strip()
+                    break
+
+        if (
+            not prod_src
+            and isinstance(row.get("Product Image", ""), str)
+            and row["Product Image"].strip()
+        ):
+            prod_src = row["Product Image"].strip()
+
+        # การ์ดทั้งใบอยู่ใน container เดียว (CSS .st-key-card_*)
+        with st.container(key=f"card_{idx}"):
+            col_img, col_info = st.columns([1.5, 2.0])
+
+            with col_img:
+                col_prod, col_spare = st.columns(2)
+
+                with col_prod:
+                    if prod_src:
+                        st.image(
+                            image_index.thumb(prod_src),
+                            use_container_width=True,
+                            caption="Product image",
+                        )
+                    else:
+                        st.markdown("**🛁 Product image**")
+                        st.caption(
+                            "ถ้ามีรูปสินค้า ให้เซฟเป็น .png แล้ววางในโฟลเดอร์ "
+                            "`images/product/` เช่น `images/product/ModelName.png`"
+                        )
+
+                with col_spare:
+                    if spare_src:
+                        st.image(
+                            image_index.thumb(spare_src),
+                            use_container_width=True,
+                            caption="Spare part image",
+                        )
+                    else:
+                        st.markdown("**🔧 Spare part image**")
+                        st.caption(
+                            "ถ้ามีรูปอะไหล่ ให้เซฟเป็นไฟล์ .png ชื่อเดียวกับ Spare Part Code "
+                            "แล้ววางในโฟลเดอร์ `images/` หรือ `images/spare/`"
+                        )
+
+                # การ์ดใช้รูปย่อ รูปเต็มส่งไปเฉพาะเมื่อกดดู
+                full_srcs = [
+                    src for src in (prod_src, spare_src)
+                    if src and image_index.thumb(src) != src
+                ]
+                if full_srcs and st.toggle("🔍 ดูรูปขนาดเต็ม", key=f"full_img_{idx}"):
+                    for src in full_srcs:
+                        st.image(src, use_container_width=True)
+
+            with col_info:
+                st.markdown(card_info_html(row), unsafe_allow_html=True)
+
+
+# =============================
+# HELPER: SEARCH-AS-YOU-TYPE
+# =============================
+
+def session_search(name: str) -> IncrementalSearch:
+    """state ของการพิมพ์ไปค้นไปใน session นี้ (แยกตามช่องค้นหา)"""
+    key = f"_incremental_{name}"
+    if key not in st.session_state:
+        st.session_state[key] = IncrementalSearch()
+    return st.session_state[key]
+
+
+def _pick_suggestion(pills_key: str, input_key: str):
+    picked = st.session_state.get(pills_key)
+    if picked:
+        st.session_state[input_key] = picked
+    st.session_state[pills_key] = None
+    _rerun_panels()
+
+
+def suggestion_pills(suggestions: list[str], query: str, input_key: str):
+    """ปุ่มคำแนะนำใต้ช่องค้นหา กดแล้วใส่คำนั้นแทนคำที่พิมพ์อยู่"""
+    options = [s for s in suggestions if normalize_text(s) != normalize_text(query)]
+    if options:
+        pills_key = f"{input_key}_suggest"
+        st.pills(
+            "คำแนะนำ",
+            options,
+            key=pills_key,
+            on_change=_pick_suggestion,
+            args=(pills_key, input_key),
+            label_visibility="collapsed",
+        )
+
+
+# =============================
+# HELPER: BATCH LOOKUP
+# =============================
+
+def render_batch(catalog, code_chunks, source: str):
+    """ค้นรหัสทีละก้อน (join ครั้งเดียวต่อก้อน) แสดงความคืบหน้า แล้วสรุปผล + ปุ่มดาวน์โหลด"""
+    progress = st.empty()
+    tables = []
+    n_codes = 0
+    try:
+        for table in iter_batch_table(catalog, code_chunks):
+            tables.append(table)
+            if len(table):
+                n_codes = int(table["No."].iat[-1])
+            progress.caption(f"กำลังค้นหา... ประมวลผลแล้ว {n_codes:,} โค้ด")
+    except CODE_FILE_ERRORS as e:
+        progress.empty()
+        st.error(f"อ่านไฟล์ **{source}** ไม่ได้: {e}")
+        return
+    progress.empty()
+
+    if not n_codes:
+        st.warning(f"ไม่พบรายการโค้ดใน **{source}**")
+        return
+
+    result = pd.concat(tables, ignore_index=True)
+    found_no = result.loc[result["Status"] == BATCH_FOUND, "No."].nunique()
+
+    st.success(f"ค้นหา {n_codes:,} โค้ดจาก **{source}**")
+    c_total, c_found, c_missing = st.columns(3)
+    c_total.metric("โค้ดทั้งหมด", f"{n_codes:,}")
+    c_found.metric("พบ", f"{found_no:,}")
+    c_missing.metric("ไม่พบ", f"{n_codes - found_no:,}")
+
+    st.download_button(
+        "⬇️ ดาวน์โหลดผลลัพธ์ (CSV)",
+        data=lambda: batch_csv(tables),
+        file_name="spare_parts_batch_result.csv",
+        mime="text/csv",
+        on_click="ignore",
+    )
+
+    if len(result) > BATCH_PREVIEW_ROWS:
+        st.caption(
+            f"แสดง {BATCH_PREVIEW_ROWS:,} แถวแรกจาก {len(result):,} แถว "
+            "(ไฟล์ดาวน์โหลดมีครบทุกแถว)"
+        )
+    st.dataframe(result.head(BATCH_PREVIEW_ROWS), use_container_width=True, hide_index=True)
+
+
+# =============================
+# UI: PANELS (fragment)
+# =============================
+# แผงค้นหาบันทึกคำค้นลง session (SEARCH_STATE) แผงผลลัพธ์อ่านไปแสดง
+# - widget ในแผงค้นหาเรียก _rerun_panels: rerun แผงค้นหาก่อนแล้วตามด้วยแผงผลลัพธ์
+# - widget ในแผงผลลัพธ์ (หน้าการ์ด / ดูรูปเต็ม) rerun เฉพาะแผงผลลัพธ์
+# ผลค้นเก็บใน cache ต่อเวอร์ชัน catalog ตาม key ของคำค้น (queries.cached_result)
+# rerun แผงผลลัพธ์ด้วยคำค้นเดิมจึงไม่ต้องค้น / เรียงใหม่
+
+SEARCH_FRAGMENT = "search_panel"
+RESULTS_FRAGMENT = "results_panel"
+SEARCH_STATE = "_search_state"
+
+DESCRIPTION_MODE = "ค้นหาจากคำอธิบายอะไหล่ (TH / EN / CN)"
+
+
+def _rerun_panels():
+    st.rerun(scope=[SEARCH_FRAGMENT, RESULTS_FRAGMENT])
+
+
+def query_result(catalog, key: tuple) -> RankedResult:
+    """ผลค้นของ key พร้อมคะแนนความเกี่ยวข้อง (ค้นจริงเฉพาะครั้งแรกของแต่ละ key)
+
+    key: ("code", รหัสตัวเล็ก, exact) / ("fuzzy", fuzzy_key) / ("model", model) /
+    ("text", คำค้นที่ normalize แล้ว) / ("description", normalize_description(คำค้น))
+    """
+    def compute() -> RankedResult:
+        kind, *args = key
+        if kind == "code":
+            code, exact = args
+            return ranked_code(catalog, code, exact=exact, session=session_search("code"))
+        if kind == "fuzzy":
+            return ranked_fuzzy(catalog, args[0])
+        if kind == "model":
+            return ranked_model(catalog, args[0])
+        if kind == "description":
+            return ranked_description(catalog, args[0], session=session_search("description"))
+        return ranked_product(catalog, args[0], session=session_search("product"))
+
+    return cached_result(catalog, key, compute)
+
+
+def batch_input():
+    """(โค้ดทีละก้อน, ชื่อแหล่ง) จากไฟล์ที่อัปโหลด / ข้อความที่วางในแผงค้นหา"""
+    batch_file = st.session_state.get("batch_file")
+    if batch_file is not None:
+        batch_file.seek(0)  # อ่านซ้ำได้ทุกครั้งที่แผงผลลัพธ์ rerun
+        return iter_code_file(batch_file, batch_file.name), batch_file.name
+
+    codes = parse_codes(st.session_state.get("batch_text", ""))
+    if codes:
+        return (codes[i:i + BATCH_CHUNK] for i in range(0, len(codes), BATCH_CHUNK)), "รายการที่วาง"
+    return None, ""
+
+
+@st.fragment(key=SEARCH_FRAGMENT)
+def search_panel():
+    # โหลดข้อมูล (ถือ catalog เวอร์ชันนี้ไว้จนจบ rerun ถึงไฟล์จะถูกอัปเดตระหว่างทาง)
+    catalog = get_catalog_store().current()
+    df = catalog.df
+
+    result_key = None  # key ของผลค้น (None = ไม่มีผลให้แสดงการ์ด)
+    batch = False
+    status_kind = "info"
+    status_text = ""
+
+    st.markdown('<div class="search-panel">', unsafe_allow_html=True)
+    st.markdown("#### 🔍 Search")
+
+    search_mode = st.radio(
+        "Search mode",
+        (
+            "ค้นหาจาก Spare Part Code",
+            "ค้นหาจาก Product / Model",
+            DESCRIPTION_MODE,
+            "ค้นหาหลายโค้ด (Batch)",
+        ),
+        label_visibility="visible",
+        on_change=_rerun_panels,
+    )
+
+    if search_mode == "ค้นหาจาก Spare Part Code":
+        code_input = st.text_input(
+            "Spare Part Code",
+            placeholder="เช่น KD236-1179",
+            key="code_query",
+            type="search",
+            live=LIVE_DEBOUNCE,
+            on_change=_rerun_panels,
+        ).strip()
+        exact_match = st.checkbox(
+            "ค้นหาแบบตรงตัว (Exact match)", value=True, on_change=_rerun_panels
+        )
+        fuzzy_match = st.checkbox(
+            "ไม่พบ ให้แสดงโค้ดที่ใกล้เคียง (พิมพ์ผิดได้)", value=True, on_change=_rerun_panels
+        )
+
+        # คำแนะนำ: รหัสที่ขึ้นต้นด้วยที่พิมพ์ ถ้าไม่มีเลย (น่าจะพิมพ์ผิด) ใช้รหัสที่ใกล้เคียงแทน
+        suggestions = suggest_codes(catalog, code_input)
+        if not suggestions and fuzzy_match:
+            suggestions = [c["code"] for c in fuzzy_codes(catalog, code_input)]
+        suggestion_pills(suggestions, code_input, "code_query")
+
+        if not code_input:
+            status_kind = "info"
+            status_text = "พิมพ์ **Spare Part Code** ทางซ้ายเพื่อเริ่มค้นหา"
+        else:
+            if "Spare Part Code" not in df.columns:
+                status_kind = "error"
+                status_text = "ไม่พบคอลัมน์ 'Spare Part Code' ในข้อมูล"
+            else:
+                key = ("code", code_input.lower(), exact_match)
+                n_found = len(query_result(catalog, key))
+
+                if not n_found and fuzzy_match:
+                    close = fuzzy_codes(catalog, code_input)
+                    if close:
+                        result_key = ("fuzzy", fuzzy_key(code_input))
+                        status_kind = "warning"
+                        status_text = (
+                            f"ไม่พบโค้ด **{code_input}** แสดงโค้ดที่ใกล้เคียงแทน: "
+                            + ", ".join(f"**{c['code']}**" for c in close)
+                        )
+                    else:
+                        status_kind = "warning"
+                        status_text = f"ไม่พบอะไหล่ที่มีโค้ด: **{code_input}**"
+                elif not n_found:
+                    status_kind = "warning"
+                    status_text = f"ไม่พบอะไหล่ที่มีโค้ด: **{code_input}**"
+                else:
+                    result_key = key
+                    status_kind = "success"
+                    status_text = f"พบ {n_found} รายการสำหรับโค้ด: **{code_input}**"
+
+    elif search_mode == DESCRIPTION_MODE:
+        description_input = st.text_input(
+            "คำอธิบายอะไหล่ (ไทย / English / 中文)",
+            placeholder="เช่น ไส้กรอง, filter, 阀芯",
+            key="description_query",
+            type="search",
+            live=LIVE_DEBOUNCE,
+            on_change=_rerun_panels,
+        ).strip()
+
+        if not description_input:
+            status_kind = "info"
+            status_text = (
+                "พิมพ์คำในคำอธิบายอะไหล่ ภาษาไทย อังกฤษ หรือจีน "
+                "เพื่อค้นหาอะไหล่ที่ไม่รู้รหัส"
+            )
+        else:
+            key = ("description", normalize_description(description_input))
+            n_found = len(query_result(catalog, key))
+
+            if not n_found:
+                status_kind = "warning"
+                status_text = f"ไม่พบอะไหล่ที่คำอธิบายตรงกับ: **{description_input}**"
+            else:
+                result_key = key
+                status_kind = "success"
+                status_text = (
+                    f"พบอะไหล่ {n_found} รายการที่คำอธิบายตรงกับ: **{description_input}**"
+                )
+
+    elif search_mode == "ค้นหาหลายโค้ด (Batch)":
+        batch_file = st.file_uploader(
+            "ไฟล์รายการโค้ด (CSV / XLSX / TXT)",
+            type=["csv", "xlsx", "txt"],
+            help="ใช้คอลัมน์ที่ชื่อมีคำว่า code / รหัส ถ้าไม่มีใช้คอลัมน์แรก",
+            key="batch_file",
+            on_change=_rerun_panels,
+        )
+        batch_text = st.text_area(
+            "หรือวางรายการโค้ด",
+            placeholder="บรรทัดละโค้ด หรือคั่นด้วย , ;\nKD236-1179\nK1125208-1",
+            height=160,
+            key="batch_text",
+            on_change=_rerun_panels,
+        )
+
+        # แผงผลลัพธ์อ่านไฟล์ / ข้อความเองจาก session (batch_input)
+        if batch_file is not None or batch_text.strip():
+            batch = True
+        else:
+            status_kind = "info"
+            status_text = (
+                "อัปโหลดไฟล์ หรือวางรายการ **Spare Part Code** ทางซ้าย "
+                "เพื่อค้นทีละหลายโค้ด (ผลลัพธ์ดาวน์โหลดเป็น CSV ได้)"
+            )
+
+    else:
+        st.markdown("**เลือกวิธีค้นหา Product / Model**")
+        product_search_mode = st.radio(
+            "ค้นหาด้วย",
+            ("เลือกจาก Model dropdown", "พิมพ์คำค้น (Product / Model)"),
+            label_visibility="collapsed",
+            on_change=_rerun_panels,
+        )
+
+        if product_search_mode == "เลือกจาก Model dropdown":
+            # หมวดหมู่
+            cat_list = ["ทั้งหมด"] + catalog.categories
+
+            category_selected = st.selectbox(
+                "หมวดหมู่สินค้า", options=cat_list, on_change=_rerun_panels
+            )
+
+            keyword_filter = st.text_input(
+                "ตัวกรองชื่อสั้นๆ (เช่น x70, ts3)",
+                placeholder="พิมพ์คำบางส่วนในชื่อรุ่น / product",
+                type="search",
+                live=LIVE_DEBOUNCE,
+                on_change=_rerun_panels,
+            ).strip()
+
+            options = build_model_options(
+                catalog,
+                keyword=keyword_filter,
+                category=category_selected,
+            )
+
+            if st.query_params.get("debug"):
+                info = catalog.model_catalog.cache_info()
+                st.caption(
+                    f"Model options cache: hit {info.hits} / miss {info.misses} "
+                    f"({info.currsize}/{info.maxsize})"
+                )
+
+            if not options:
+                status_kind = "info"
+                status_text = (
+                    "ยังไม่พบ Model ที่ตรงกับเงื่อนไขที่เลือก\n"
+                    "ลองเปลี่ยนหมวดหมู่ หรือเคลียร์ตัวกรองชื่อสั้นดูก่อน"
+                )
+            else:
+                labels = ["— เลือก Model —"] + [opt[0] for opt in options]
+                label_selected = st.selectbox(
+                    "เลือก Model", options=labels, on_change=_rerun_panels
+                )
+
+                if label_selected == "— เลือก Model —":
+                    status_kind = "info"
+                    status_text = "เลือก Model ด้านบนเพื่อดูรายการอะไหล่ทั้งหมดของรุ่นนั้น"
+                else:
+                    label_to_model = {lbl: mdl for lbl, mdl in options}
+                    model_selected = label_to_model[label_selected]
+
+                    key = ("model", model_selected)
+                    n_found = len(query_result(catalog, key))
+
+                    if not n_found:
+                        status_kind = "warning"
+                        status_text = f"ไม่พบอะไหล่สำหรับ Model: **{model_selected}**"
+                    else:
+                        result_key = key
+                        status_kind = "success"
+                        status_text = (
+                            f"พบอะไหล่ {n_found} รายการสำหรับ Model: "
+                            f"**{model_selected}**"
+                        )
+        else:
+            product_input = st.text_input(
+                "Product / Model",
+                placeholder="เช่น X70, TS3, ZD9640 หรือคำบางส่วนในชื่อรุ่น",
+                key="product_query",
+                type="search",
+                live=LIVE_DEBOUNCE,
+                on_change=_rerun_panels,
+            ).strip()
+            suggestion_pills(
+                suggest_products(catalog, product_input), product_input, "product_query"
+            )
+
+            if not product_input:
+                status_kind = "info"
+                status_text = (
+                    "พิมพ์ชื่อรุ่น หรือคำในชื่อ Product / Model ด้านบน "
+                    "หรือเลือกจาก Model dropdown ก็ได้"
+                )
+            else:
+                key = ("text", normalize_text(product_input))
+                n_found = len(query_result(catalog, key))
+
+                if not n_found:
+                    status_kind = "warning"
+                    status_text = (
+                        f"ไม่พบ Product / Model ที่ตรงกับคำว่า: **{product_input}**"
+                    )
+                else:
+                    result_key = key
+                    status_kind = "success"
+                    status_text = (
+                        f"พบอะไหล่ {n_found} รายการสำหรับคำค้น: "
+                        f"**{product_input}**"
+                    )
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    st.session_state[SEARCH_STATE] = {
+        "status": (status_kind, status_text),
+        "result_key": result_key,
+        "batch": batch,
+    }
+
+
+@st.fragment(key=RESULTS_FRAGMENT)
+def results_panel():
+    state = st.session_state.get(SEARCH_STATE) or {}
+    status_kind, status_text = state.get("status", ("info", ""))
+    catalog = get_catalog_store().current()
+
+    if status_text:
+        if status_kind == "info":
+            st.info(status_text)
+        elif status_kind == "warning":
+            st.warning(status_text)
+        elif status_kind == "error":
+            st.error(status_text)
+        elif status_kind == "success":
+            st.success(status_text)
+
+    if state.get("batch"):
+        batch_chunks, batch_source = batch_input()
+        if batch_chunks is not None:
+            render_batch(catalog, batch_chunks, batch_source)
+
+    result_key = state.get("result_key")
+    result = query_result(catalog, result_key) if result_key else None
+    if result:
+        summary_cols = [c for c in [
+            "Model",
+            "Product Name",
+            "Spare Part Code",
+            "Description (TH)",
+            "Description (EN)",
+            "Spare Parts Qty",
+        ] if c in catalog.df.columns]
+
+        if summary_cols:
+            st.markdown("**ภาพรวมอะไหล่ของรุ่นนี้ (Summary List)**")
+            # เรียงทั้งชุดเฉพาะเมื่อขอ (ผลกว้างๆ หลายร้อยแถว) ปกติแสดงตามลำดับที่ค้นพบ
+            summary_ranked = st.toggle(
+                "เรียงตามความเกี่ยวข้อง (ลำดับเดียวกับการ์ดด้านล่าง)", key="summary_ranked"
+            )
+            positions = result.ranked() if summary_ranked else result.positions()
+            st.dataframe(
+                catalog.df.iloc[positions][summary_cols].reset_index(drop=True),
+                use_container_width=True,
+                hide_index=True,
+            )
+
+        st.markdown("---")
+        st.markdown("**รายละเอียดแต่ละอะไหล่ (Detail View)**")
+        st.caption("เรียงตามความเกี่ยวข้องกับคำค้น")
+
+        # แบ่งหน้าการ์ด ผลค้นกว้างๆ จะได้ไม่ต้องสร้างการ์ดทุกแถวในครั้งเดียว
+        n_rows = len(result)
+        page_size = CARDS_PER_PAGE
+        page = 1
+        if n_rows > CARDS_PER_PAGE:
+            c_size, c_page = st.columns(2)
+            with c_size:
+                page_size = st.selectbox(
+                    "จำนวนการ์ดต่อหน้า",
+                    options=PAGE_SIZE_OPTIONS,
+                    index=PAGE_SIZE_OPTIONS.index(CARDS_PER_PAGE),
+                    key="cards_page_size",
+                )
+            n_pages = -(-n_rows // page_size)
+            with c_page:
+                page = st.number_input(
+                    f"หน้า (ทั้งหมด {n_pages} หน้า)",
+                    min_value=1,
+                    max_value=n_pages,
+                    value=1,
+                    step=1,
+                    key=f"cards_page:{':'.join(map(str, result_key))}:{page_size}",
+                )
+
+        start = (page - 1) * page_size
+        end = min(start + page_size, n_rows)
+        if n_rows > page_size:
+            st.caption(
+                f"แสดงการ์ด {start + 1}–{end} จาก {n_rows} รายการ "
+                "(ดูครบทุกรายการได้ในตาราง Summary List ด้านบน)"
+            )
+        image_index = load_image_index()
+        image_index.refresh()
+        # เลือกเฉพาะ end อันดับแรกด้วย heap ไม่ต้องเรียงผลทั้งชุด
+        render_cards(catalog.df.iloc[result.top(end)[start:end]], image_index)
+
+
+# =============================
+# UI / APP
+# =============================
+
+def main():
+    st.set_page_config(
+        page_title="TOA | JOMOO After Sale Service",
+        layout="wide",
+    )
+
+    # ---------- GLOBAL CSS ----------
+    st.markdown(
+        """
+        <style>
+        :root {
+            --toa-navy: #071427;
+            --toa-blue: #1B4EA3;
+            --toa-gold: #C89A55;
+            --toa-bg: #F4F7FB;
+        }
+
+        header[data-testid="stHeader"] {display: none;}
+        [data-testid="stToolbar"] {display: none;}
+        .block-container {padding-top: 0.5rem;}
+
+        .stApp {
+            background: var(--toa-bg);
+            font-family: "Segoe UI", system-ui, -apple-system, BlinkMacSystemFont, sans-serif;
+        }
+
+        .hero {
+            width: 100%;
+            padding: 1.4rem 1.8rem;
+            border-radius: 18px;
+            background: radial-gradient(circle at top left, #213b72 0%, #050B14 60%);
+            color: #ffffff;
+            margin-bottom: 1.4rem;
+            display: flex;
+            flex-direction: column;
+            gap: 0.35rem;
+            box-shadow: 0 14px 40px rgba(0,0,0,0.25);
+        }
+        .hero-title {
+            font-size: 1.7rem;
+            font-weight: 800;
+            letter-spacing: 0.03em;
+        }
+        .hero-sub {
+            opacity: 0.9;
+            font-size: 0.95rem;
+            line-height: 1.5;
+        }
+
+        .search-panel {
+            padding: 0.9rem 1.1rem;
+            border-radius: 18px;
+            background: #0B1220;
+            color: #ffffff;
+            box-shadow: 0 14px 30px rgba(15,23,42,0.25);
+        }
+        .search-panel h4 {
+            margin-bottom: 0.4rem;
+        }
+
+        .card, div[class*="st-key-card_"] {
+            padding: 0.9rem 1.1rem;      /* กระชับลง */
+            border-radius: 18px;
+            border: 1px solid #E2E8F0;
+            box-shadow: 0 12px 28px rgba(15, 23, 42, 0.06);
+            margin-bottom: 1.0rem;       /* ระยะห่างการ์ดต่อการ์ด */
+            background-color: #ffffff;
+        }
+
+        .field-label {
+            font-weight: 600;
+            color: #4B5563;
+        }
+
+        .card h3, .card h4, .card h5, .card-info h3 {
+            color: var(--toa-navy);
+        }
+
+        .field-grid {
+            display: grid;
+            grid-template-columns: 1fr 1fr;
+            column-gap: 1rem;
+        }
+
+        .stAlert.success {
+            background-color: #E0F2FE;
+            border-radius: 999px;
+        }
+        .stAlert.warning {
+            background-color: #FEF3C7;
+            border-radius: 999px;
+        }
+
+        .subheading {
+            font-size: 0.95rem;
+            color: #6B7280;
+            margin-bottom: 0.15rem;      /* เดิมเยอะกว่านี้ */
+        }
+
+        .card hr, .card-info hr {
+            margin: 0.35rem 0 0.55rem 0;
+            border-color: #E5E7EB;
+        }
+
+        .stRadio > div[role="radiogroup"] {
+            gap: 0.25rem;
+        }
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    # ---------- HERO ----------
+    st.markdown(
+        """
+        <div class="hero">
+            <div class="hero-title">TOA | JOMOO After Sale Service Teams</div>
+            <div class="hero-sub">
+                ศูนย์กลางข้อมูลอะไหล่สำหรับทีม After Sale Service ของ TOA / JOMOO
+                ค้นหาจากรหัสอะไหล่ หรือค้นจากรุ่นสินค้า (เช่น X70, TS3) เพื่อดูอะไหล่ทั้งหมดของรุ่นนั้น
+            </div>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+    # แผงค้นหา / แผงผลลัพธ์เป็น fragment แยกกัน (ดู UI: PANELS) rerun ทั้งแอป
+    # เฉพาะตอนเปิดหน้าครั้งแรก CSS / hero ด้านบนจึงไม่ถูกรันและส่งซ้ำทุกครั้งที่กด
+    search_col, result_col = st.columns([0.9, 2.1])
+    with search_col:
+        search_panel()
+    with result_col:
+        results_panel()
+
+
+if __name__ == "__main__":
+    main()
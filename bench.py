@@ -0,0 +1,352 @@
+from pathlib import Path
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from catalog import Catalog, CatalogStore, read_excel_sources
+from queries import (
+    batch_table,
+    build_model_options,
+    fuzzy_codes,
+    model_parts,
+    ranked_product,
+    search_code,
+    search_description,
+    search_product,
+    suggest_codes,
+    suggest_products,
+)
+from search_index import IncrementalSearch
+
+
+# =============================
+# CONFIG
+# =============================
+
+BASE = Path(__file__).parent
+BASELINE_FILE = "bench_baseline.json"
+DEFAULT_REPEAT = 7
+
+# ช้าลง / ใช้หน่วยความจำเพิ่มเกินสัดส่วนนี้เทียบกับ baseline = regression
+# (มีค่าขั้นต่ำกันเคสเล็กๆ ที่แกว่งตาม noise ของเครื่อง)
+TIME_TOLERANCE = 0.25
+TIME_FLOOR_MS = 2.0
+MEMORY_TOLERANCE = 0.10
+MEMORY_FLOOR_KB = 256
+BLOCKS_TOLERANCE = 0.10
+BLOCKS_FLOOR = 1000
+
+PRODUCT_WORDS = ["toilet", "smart", "basin", "faucet", "x70", "ts3", "shower", "cabinet"]
+MODEL_KEYWORDS = ["", "toilet", "x70", "ts3", "smart"]
+# คำอธิบายอะไหล่ปนภาษา (ไทย / อังกฤษ / จีน)
+DESCRIPTION_WORDS = ["ไส้กรอง", "สายน้ำดี", "filters", "hose", "sensor", "阀芯", "编织管", "ฝา"]
+APP_FILE = str(BASE / "app.py")
+APP_TIMEOUT = 120
+
+
+class Case:
+    """งานหนึ่งชิ้นที่วัด: setup() เตรียมของ (ไม่จับเวลา) แล้ว run(state) คืองานที่วัดจริง"""
+
+    def __init__(self, name: str, run, setup=None, repeat: int = DEFAULT_REPEAT, warmup: bool = True):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda: None)
+        self.repeat = repeat
+        self.warmup = warmup
+
+
+# =============================
+# MEASURE
+# =============================
+
+def measure(case: Case, repeat: int | None = None) -> dict:
+    """เวลา (median / min ของทุกรอบ) + peak memory / blocks / gc จากอีกรอบที่เปิด tracemalloc
+
+    เทียบ baseline ด้วยเวลา min ซึ่งแกว่งตาม noise ของเครื่องน้อยกว่า median
+    tracemalloc ทำให้โค้ดช้าลงหลายเท่า จึงแยกรอบวัดหน่วยความจำออกจากรอบจับเวลา
+    - peak_kb: หน่วยความจำสูงสุดที่ Python จองระหว่างรัน (tracemalloc)
+    - blocks:  จำนวน memory block ที่เพิ่มขึ้นและยังค้างอยู่หลังรัน (sys.getallocatedblocks)
+    - gc0:     จำนวนครั้งที่ gc รุ่น 0 ทำงาน ~ ทุกๆ 700 object ที่สร้างใหม่ (วัดการสร้าง object ทิ้ง)
+    """
+    with contextlib.redirect_stdout(io.StringIO()):  # ไม่ให้ print ของโค้ดที่วัดปนกับตารางผล
+        return _measure(case, repeat)
+
+
+def _measure(case: Case, repeat: int | None) -> dict:
+    if case.warmup:
+        case.run(case.setup())
+
+    times = []
+    for _ in range(repeat or case.repeat):
+        state = case.setup()
+        gc.collect()
+        t0 = time.perf_counter()
+        case.run(state)
+        times.append((time.perf_counter() - t0) * 1e3)
+        del state
+
+    state = case.setup()
+    gc.collect()
+    gen0 = gc.get_stats()[0]["collections"]
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    result = case.run(state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sys.getallocatedblocks() - blocks
+    gen0 = gc.get_stats()[0]["collections"] - gen0
+    del result, state
+
+    return {
+        "time_ms": round(statistics.median(times), 3),
+        "min_ms": round(min(times), 3),
+        "peak_kb": round(peak / 1024, 1),
+        "blocks": blocks,
+        "gc0": gen0,
+    }
+
+
+def regressions(name: str, now: dict, base: dict, time_tolerance: float = TIME_TOLERANCE) -> list[str]:
+    """เทียบกับ baseline คืนข้อความของค่าที่แย่ลงเกิน tolerance"""
+    out = []
+    checks = [
+        ("min_ms", time_tolerance, TIME_FLOOR_MS, "ms"),
+        ("peak_kb", MEMORY_TOLERANCE, MEMORY_FLOOR_KB, "KB"),
+        ("blocks", BLOCKS_TOLERANCE, BLOCKS_FLOOR, ""),
+    ]
+    for key, tolerance, floor, unit in checks:
+        if key not in base:
+            continue
+        limit = base[key] + max(abs(base[key]) * tolerance, floor)
+        if now[key] > limit:
+            out.append(f"{name}: {key} {base[key]}{unit} -> {now[key]}{unit}")
+    return out
+
+
+# =============================
+# CASES
+# =============================
+
+def _cards_script(positions):
+    # รันเป็นสคริปต์ Streamlit ผ่าน AppTest.from_function (import ต้องอยู่ในฟังก์ชัน)
+    from app import get_catalog_store, load_image_index, render_cards
+
+    catalog = get_catalog_store().current()
+    render_cards(catalog.df.iloc[positions], load_image_index())
+
+
+def _app_at(*steps):
+    """setup ของเคส app/*: เปิดแอปแล้วทำตาม steps (ไม่จับเวลา) คืน AppTest ที่พร้อมรอบถัดไป"""
+    from streamlit.testing.v1 import AppTest
+
+    def setup():
+        at = AppTest.from_file(APP_FILE, default_timeout=APP_TIMEOUT).run()
+        for step in steps:
+            step(at)
+        return at
+    return setup
+
+
+def _check(at):
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at
+
+
+def build_cases(catalog: Catalog, seed: int = 0) -> list[Case]:
+    """ชุดงานมาตรฐาน สุ่มด้วย seed คงที่ ผลแต่ละรอบจึงเทียบกันได้"""
+    from streamlit.testing.v1 import AppTest
+
+    df = catalog.df
+    rng = random.Random(seed)
+    codes = sorted({c for c in df["Spare Part Code"].dropna().tolist() if c})
+    models = sorted({m for _, m in catalog.model_catalog.options("", "")})
+
+    exact_codes = rng.sample(codes, min(200, len(codes)))
+    prefixes = [c[:4] for c in rng.sample(codes, min(50, len(codes)))]
+    sample_models = rng.sample(models, min(100, len(models)))
+    batch_codes = [rng.choice(codes) for _ in range(4500)] + [f"X-{i:05d}" for i in range(500)]
+    rng.shuffle(batch_codes)
+    option_queries = [(cat, kw) for cat in [""] + catalog.categories for kw in MODEL_KEYWORDS]
+    toilet_rows = catalog.text_index.search("toilet")
+
+    # รหัสพิมพ์ผิด: ขีดหาย / ตัวเลขสลับ / 0 เป็น O
+    typos = [
+        [c.replace("-", ""), c[:-2] + c[-1] + c[-2], c.replace("0", "O")][i % 3]
+        for i, c in enumerate(exact_codes[:100])
+    ]
+
+    # พิมพ์ทีละตัวอักษร (แต่ละ prefix คือหนึ่ง rerun ของช่องค้นหาแบบ live)
+    typed_codes = [c[:i] for c in exact_codes[:20] for i in range(1, len(c) + 1)]
+    typed_words = [w[:i] for w in PRODUCT_WORDS for i in range(1, len(w) + 1)]
+
+    def typing(session_factory):
+        def run(_):
+            code_session, product_session = session_factory(), session_factory()
+            for q in typed_codes:
+                search_code(catalog, q, exact=False, session=code_session)
+            for q in typed_words:
+                search_product(catalog, q, session=product_session)
+        return run
+
+    def fresh_options():
+        catalog.model_catalog.options.cache_clear()
+
+    def all_options(_=None):
+        return [build_model_options(catalog, kw, cat) for cat, kw in option_queries]
+
+    def cards_app(n):
+        return lambda: AppTest.from_function(
+            _cards_script, default_timeout=APP_TIMEOUT, args=(toilet_rows[:n],)
+        )
+
+    product_mode = "ค้นหาจาก Product / Model"
+
+    return [
+        # ---------- load ----------
+        Case("load/snapshot", lambda _: CatalogStore(BASE).current(), repeat=3, warmup=False),
+        Case("load/excel", lambda _: read_excel_sources(BASE), repeat=3, warmup=False),
+        Case("load/index", lambda _: Catalog(df), repeat=3),
+
+        # ---------- model dropdown ----------
+        Case(f"options/cold x{len(option_queries)}", all_options, setup=fresh_options),
+        Case(f"options/warm x{len(option_queries)}", all_options),
+
+        # ---------- search ----------
+        Case(f"search/code-exact x{len(exact_codes)}",
+             lambda _: [search_code(catalog, c) for c in exact_codes]),
+        Case(f"search/code-partial x{len(prefixes)}",
+             lambda _: [search_code(catalog, c, exact=False) for c in prefixes]),
+        Case(f"search/product x{len(PRODUCT_WORDS)}",
+             lambda _: [search_product(catalog, w) for w in PRODUCT_WORDS]),
+        Case(f"search/description x{len(DESCRIPTION_WORDS)}",
+             lambda _: [search_description(catalog, w) for w in DESCRIPTION_WORDS]),
+        Case(f"search/model-parts x{len(sample_models)}",
+             lambda _: [model_parts(catalog, m) for m in sample_models]),
+        Case(f"search/batch x{len(batch_codes)}", lambda _: batch_table(catalog, batch_codes)),
+        Case(f"search/fuzzy x{len(typos)}", lambda _: [fuzzy_codes(catalog, c) for c in typos]),
+
+        # หน้าการ์ดแรก: เรียงผลทั้งชุด (แบบเดิม) เทียบกับให้คะแนน + heap top-k
+        Case(
+            f"rank/full-sort x{len(PRODUCT_WORDS)}",
+            lambda _: [search_product(catalog, w).sort_values(["Model", "Spare Part Code"]).iloc[:10]
+                       for w in PRODUCT_WORDS],
+        ),
+        Case(
+            f"rank/top10 x{len(PRODUCT_WORDS)}",
+            lambda _: [df.iloc[ranked_product(catalog, w).top(10)] for w in PRODUCT_WORDS],
+        ),
+        Case(f"typing/full x{len(typed_codes) + len(typed_words)}", typing(lambda: None)),
+        Case(f"typing/incremental x{len(typed_codes) + len(typed_words)}", typing(IncrementalSearch)),
+        Case(
+            f"typing/suggest x{len(typed_codes) + len(typed_words)}",
+            lambda _: ([suggest_codes(catalog, q) for q in typed_codes],
+                       [suggest_products(catalog, q) for q in typed_words]),
+        ),
+
+        # ---------- render (Streamlit script ผ่าน AppTest) ----------
+        Case("cards/10", lambda at: _check(at.run()), setup=cards_app(10)),
+        Case("cards/50", lambda at: _check(at.run()), setup=cards_app(50)),
+        Case(
+            "app/code-exact",
+            lambda at: _check(at.text_input[0].input(exact_codes[0]).run()),
+            setup=_app_at(),
+        ),
+        Case(
+            "app/product-text",
+            lambda at: _check(at.text_input[0].input("toilet").run()),
+            setup=_app_at(
+                lambda at: at.radio[0].set_value(product_mode).run(),
+                lambda at: at.radio[1].set_value(at.radio[1].options[1]).run(),
+            ),
+        ),
+        Case(
+            "app/model-dropdown",
+            lambda at: _check(at.selectbox[1].set_value(at.selectbox[1].options[1]).run()),
+            setup=_app_at(lambda at: at.radio[0].set_value(product_mode).run()),
+        ),
+    ]
+
+
+# =============================
+# MAIN
+# =============================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="benchmark งานหลักของแอป (โหลด catalog / dropdown / ค้นหา / การ์ด) เทียบกับ baseline"
+    )
+    parser.add_argument("-k", "--filter", default="", help="วัดเฉพาะเคสที่ชื่อมีคำนี้ เช่น search/")
+    parser.add_argument("-r", "--repeat", type=int, help="จำนวนรอบจับเวลาต่อเคส (ไม่ระบุ = ค่าของแต่ละเคส)")
+    parser.add_argument("--baseline", default=str(BASE / BASELINE_FILE))
+    parser.add_argument("--save", action="store_true", help="บันทึกผลรอบนี้เป็น baseline ใหม่")
+    parser.add_argument(
+        "--time-tolerance", type=float, default=TIME_TOLERANCE,
+        help="ยอมให้ช้าลงได้กี่ส่วน (0.25 = 25%%) เครื่องที่ใช้ CPU ร่วมกับงานอื่นควรตั้งสูงขึ้น",
+    )
+    args = parser.parse_args()
+
+    catalog = CatalogStore(BASE).current()
+    cases = [c for c in build_cases(catalog) if args.filter in c.name]
+
+    baseline_path = Path(args.baseline)
+    baseline = {}
+    if baseline_path.exists() and not args.save:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        if baseline.get("catalog") != catalog.version[:16]:
+            print(f"หมายเหตุ: baseline วัดกับข้อมูลคนละเวอร์ชัน ({baseline.get('catalog')})")
+
+    print(f"catalog {catalog.version[:16]} ({len(catalog)} แถว), python {platform.python_version()}\n")
+    print(f"{'case':<28} {'median ms':>10} {'min ms':>9} {'peak KB':>10} {'blocks':>8} {'gc0':>5}  vs baseline")
+
+    results = {}
+    failed = []
+    for case in cases:
+        now = measure(case, args.repeat)
+        results[case.name] = now
+
+        base = baseline.get("cases", {}).get(case.name)
+        note = ""
+        if base:
+            note = f"{(now['min_ms'] / base['min_ms'] - 1) * 100:+.0f}%" if base["min_ms"] else ""
+            bad = regressions(case.name, now, base, args.time_tolerance)
+            if bad:
+                failed.extend(bad)
+                note += "  REGRESSION"
+        print(
+            f"{case.name:<28} {now['time_ms']:>10.2f} {now['min_ms']:>9.2f} "
+            f"{now['peak_kb']:>10.1f} {now['blocks']:>8} {now['gc0']:>5}  {note}"
+        )
+
+    if args.save:
+        merged = {}
+        if baseline_path.exists():
+            merged = json.loads(baseline_path.read_text(encoding="utf-8")).get("cases", {})
+        merged.update(results)
+        baseline_path.write_text(json.dumps({
+            "catalog": catalog.version[:16],
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "cases": merged,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\nบันทึก baseline: {baseline_path}")
+    elif not baseline:
+        print(f"\nยังไม่มี baseline ({baseline_path}) ใช้ --save เพื่อบันทึกผลรอบนี้")
+
+    if failed:
+        print("\nช้าลง / ใช้หน่วยความจำมากขึ้นเกินเกณฑ์:")
+        for line in failed:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
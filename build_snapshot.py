@@ -0,0 +1,27 @@
+from pathlib import Path
+import time
+
+from catalog import read_excel_sources, snapshot_path, source_hash, write_snapshot
+from ingest import IMAGES_DIR, make_thumbnails
+
+
+def main():
+    base = Path(__file__).parent
+
+    digest = source_hash(base)
+    target = snapshot_path(base, digest)
+    print(f"hash ของไฟล์ต้นฉบับ: {digest[:16]}")
+
+    t0 = time.perf_counter()
+    df = read_excel_sources(base)
+    print(f"อ่าน Excel เสร็จ: {len(df)} แถว ({time.perf_counter() - t0:.2f}s)")
+
+    write_snapshot(df, target)
+    print(f"บันทึก snapshot: {target} ({target.stat().st_size / 1024:.1f} KB)")
+
+    # รูปย่อที่การ์ดใช้ (ข้ามรูปที่รูปย่อล่าสุดแล้ว) ไม่มีรูปย่อแอปจะส่งรูปเต็มแทน
+    make_thumbnails(base / IMAGES_DIR)
+
+
+if __name__ == "__main__":
+    main()
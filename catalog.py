@@ -0,0 +1,572 @@
+from pathlib import Path
+import hashlib
+import re
+import threading
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from ingest import SLIM_FILE, read_sheet_columns, sheet_parts
+from search_index import (
+    PRODUCT_FIELDS,
+    CodeIndex,
+    DescriptionIndex,
+    ModelCatalog,
+    PrefixIndex,
+    TextIndex,
+)
+
+
+# =============================
+# CONFIG
+# =============================
+
+COMBINE_FILE = SLIM_FILE
+CN_FILE = "TOA main spare parts recommendation DATA.xlsx"
+
+# โฟลเดอร์เก็บ snapshot (Parquet) ที่คอมไพล์จาก Excel ทั้งสองไฟล์
+SNAPSHOT_DIR = "snapshot"
+# เปลี่ยนเลขนี้เมื่อแก้ logic การอ่าน/merge เพื่อให้ snapshot เก่าใช้ไม่ได้
+SNAPSHOT_VERSION = 4
+
+# ความถี่ที่ watcher เช็คว่าไฟล์ Excel ถูกแก้หรือยัง (วินาที)
+WATCH_INTERVAL = 5.0
+
+
+# =============================
+# SOURCE HASH / SNAPSHOT PATH
+# =============================
+
+def source_paths(base: Path) -> list[Path]:
+    return [base / COMBINE_FILE, base / CN_FILE]
+
+
+def source_hash(base: Path) -> str:
+    """hash จากเนื้อหาไฟล์ Excel ทั้งสอง + SNAPSHOT_VERSION ใช้เป็น key ของ snapshot"""
+    h = hashlib.sha256(f"v{SNAPSHOT_VERSION}".encode())
+    for path in source_paths(base):
+        h.update(path.name.encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def snapshot_path(base: Path, digest: str) -> Path:
+    return base / SNAPSHOT_DIR / f"catalog-{digest[:16]}.parquet"
+
+
+# =============================
+# READ EXCEL & MERGE
+# =============================
+
+_SHARED_STRING_RE = re.compile(rb"<si\b[^>]*?(?:/>|>(.*?)</si>)", re.DOTALL)
+_SHARED_CELL_RE = re.compile(rb'(<c\b[^>]*\bt="s"[^>]*>\s*<v>)(\d+)(</v>)')
+
+
+def sheet_hashes(xlsx_path: Path) -> dict[str, str]:
+    """hash ของแต่ละชีต (ชื่อชีต -> hash) โดยไม่ต้อง parse ข้อมูลในชีต
+
+    อ่าน XML ของชีตตรงๆ จากไฟล์ .xlsx (เป็น zip) ข้อความในเซลล์เก็บเป็นเลขอ้างอิงไปที่
+    sharedStrings.xml จึงแทนเลขอ้างอิงด้วยข้อความจริงก่อน hash ชีตที่ไม่ได้แก้จึงได้ hash
+    เดิมแม้ชีตอื่นจะเพิ่มข้อความใหม่ (ตาราง sharedStrings ทั้งไฟล์ถูกเขียนใหม่ / เลขเลื่อน)
+    """
+    with zipfile.ZipFile(xlsx_path) as zf:
+        names = set(zf.namelist())
+        shared = zf.read("xl/sharedStrings.xml") if "xl/sharedStrings.xml" in names else b""
+        strings = [m.group(1) or b"" for m in _SHARED_STRING_RE.finditer(shared)]
+
+        def resolve(m: re.Match) -> bytes:
+            idx = int(m.group(2))
+            text = strings[idx] if idx < len(strings) else b""
+            return m.group(1) + text + m.group(3)
+
+        hashes = {}
+        for title, part in sheet_parts(zf).items():
+            xml = _SHARED_CELL_RE.sub(resolve, zf.read(part))
+            hashes[title] = hashlib.sha256(xml).hexdigest()
+    return hashes
+
+
+def read_combine_sheets(
+    combine_path: Path,
+    sheet_cache: dict | None = None,
+) -> pd.DataFrame:
+    """อ่านทุกชีตของ Combine_DATA.xlsx ในการเปิดไฟล์ครั้งเดียว (openpyxl read-only)
+
+    ทำ rename / ffill Model, Product Name / ตัดแถวว่าง ไปพร้อมกับไล่แถว
+    แล้วสร้าง DataFrame ทีเดียวตอนจบ ไม่ต้องมี DataFrame ต่อชีตแล้ว concat
+
+    sheet_cache (ถ้าส่งมา): dict ชื่อชีต -> (hash, columns, n_rows) ชีตที่ hash ไม่เปลี่ยน
+    ใช้ของเดิมไม่ต้อง parse ใหม่ และ dict จะถูกอัปเดตให้ตรงกับไฟล์ล่าสุด
+    """
+    from openpyxl import load_workbook
+
+    hashes = sheet_hashes(combine_path) if sheet_cache is not None else {}
+    pieces: list[tuple[str, dict[str, list], int]] = []
+    parsed = []
+
+    wb = load_workbook(combine_path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            cached = sheet_cache.get(ws.title) if sheet_cache is not None else None
+            if cached is not None and cached[0] == hashes.get(ws.title):
+                columns, n_rows = cached[1], cached[2]
+            else:
+                columns, n_rows = read_sheet_columns(ws)
+                parsed.append(ws.title)
+            pieces.append((ws.title, columns, n_rows))
+    finally:
+        wb.close()
+
+    if sheet_cache is not None:
+        sheet_cache.clear()
+        for title, columns, n_rows in pieces:
+            sheet_cache[title] = (hashes.get(title), columns, n_rows)
+        print(f"อ่านชีตใหม่ {len(parsed)}/{len(pieces)}: {', '.join(parsed) or '-'}")
+
+    return combine_sheet_columns(pieces)
+
+
+def combine_sheet_columns(pieces: list[tuple[str, dict[str, list], int]]) -> pd.DataFrame:
+    """รวม (ชื่อชีต, คอลัมน์, จำนวนแถว) ของทุกชีตเป็น DataFrame เดียว + คอลัมน์ Category"""
+    # รวมทุกชีตเป็นคอลัมน์เดียว คอลัมน์ที่ชีตไหนไม่มีเติม None
+    names: list[str] = []
+    for _, columns, _ in pieces:
+        names.extend(n for n in columns if n not in names)
+
+    data: dict[str, list] = {"Category": []}
+    for name in names:
+        data[name] = []
+    for title, columns, n_rows in pieces:
+        data["Category"].extend([title] * n_rows)
+        for name in names:
+            values = columns.get(name)
+            data[name].extend(values if values is not None else [None] * n_rows)
+
+    return pd.DataFrame(data)
+
+
+def read_excel_sources(base: Path, sheet_cache: dict | None = None) -> pd.DataFrame:
+    """อ่าน Combine_DATA.xlsx ทุกชีต + merge กับ CN recommendation (ทางช้า)"""
+    combine_path = base / COMBINE_FILE
+    cn_path = base / CN_FILE
+
+    parts = read_combine_sheets(combine_path, sheet_cache)
+    return merge_sources(parts, cn_path)
+
+
+def merge_sources(parts: pd.DataFrame, cn_path: Path) -> pd.DataFrame:
+    """parts ทุกชีต (จาก read_combine_sheets) + CN recommendation -> catalog schema เดียวกับ snapshot"""
+    if parts.empty:
+        raise ValueError("ไม่พบข้อมูลในไฟล์ Combine_DATA.xlsx เลย")
+
+    if "Spare Part Code" not in parts.columns:
+        raise KeyError(
+            "ไม่พบคอลัมน์ 'Spare Part Code' ในไฟล์ Combine_DATA.xlsx\n"
+            "กรุณาเปิดไฟล์แล้วเช็คว่าชื่อคอลัมน์เขียนว่า 'Spare Part Code' หรือเปล่า"
+        )
+
+    parts["Spare Part Code"] = parts["Spare Part Code"].astype(str).str.strip()
+    if "Model" not in parts.columns:
+        parts["Model"] = ""
+    if "Product Name" not in parts.columns:
+        parts["Product Name"] = ""
+
+    cn = read_cn_recommendations(cn_path)
+    merged = join_cn(parts, cn)
+
+    return compact_schema(_arrow_safe(merged))
+
+
+CN_COLUMNS = {
+    "Product name": "CN Product Name",
+    "Spare part number": "Spare Part Code",
+    "Spare part name": "CN Spare Part Name",
+    "Recommended Quantity": "CN Recommended Qty",
+}
+
+
+def read_cn_recommendations(cn_path: Path) -> pd.DataFrame:
+    """อ่านชีต CN recommendation (ชีตนี้ก็ใส่ Model / Product name แค่แถวแรกของบล็อกเหมือนกัน)"""
+    cn = pd.read_excel(cn_path, sheet_name="Sheet1", engine="openpyxl")
+    cn.rename(columns=CN_COLUMNS, inplace=True)
+    cn = cn.loc[:, ~cn.columns.duplicated()]
+
+    keep_cols = [
+        col for col in [
+            "Model",
+            "Spare Part Code",
+            "CN Product Name",
+            "CN Spare Part Name",
+            "CN Recommended Qty",
+            "Remark",
+        ]
+        if col in cn.columns
+    ]
+    cn = cn[keep_cols].dropna(how="all")
+
+    for col in ("Model", "CN Product Name"):
+        if col in cn.columns:
+            cn[col] = cn[col].ffill()
+    return cn
+
+
+def normalize_key(s: pd.Series) -> pd.Series:
+    """normalize key สำหรับ join (vectorized ทั้งคอลัมน์)
+
+    NFKC (ตัวอักษร full-width -> ปกติ), ตัดช่องว่างทั้งหมด, ตัวพิมพ์ใหญ่,
+    รหัสตัวเลขที่ถูกอ่านเป็น float เช่น "140300130.0" -> "140300130",
+    NaN / "nan" / "None" -> ""
+    """
+    key = (
+        s.astype("string")
+        .str.normalize("NFKC")
+        .str.replace(r"\s+", "", regex=True)
+        .str.upper()
+        .str.replace(r"^(\d+)\.0+$", r"\1", regex=True)
+    )
+    return key.fillna("").replace({"NAN": "", "NONE": ""}).astype(object)
+
+
+def join_cn(parts: pd.DataFrame, cn: pd.DataFrame) -> pd.DataFrame:
+    """left join ข้อมูล CN recommendation เข้ากับ parts ด้วย key ที่ normalize แล้ว
+
+    - join ด้วย (Model, Spare Part Code) ถ้าชีต CN ไม่มีคอลัมน์ Model ใช้ Spare Part Code อย่างเดียว
+    - key ซ้ำในชีต CN เอาแถวแรก (กันแถว parts งอก)
+    - ตาราง CN เก็บเป็น categorical ก่อน join คอลัมน์ CN ใน catalog จึงเป็น categorical ด้วย
+    - สถิติการ join อยู่ใน merged.attrs["cn_join"]
+    """
+    if "Spare Part Code" not in cn.columns:
+        print("CN join: ไม่พบคอลัมน์ 'Spare part number' ในไฟล์ CN ข้ามการ join")
+        return parts
+
+    on = ["_code_key"]
+    table = cn.drop(columns=["Spare Part Code"])
+    table["_code_key"] = normalize_key(cn["Spare Part Code"])
+    if "Model" in cn.columns:
+        table["_model_key"] = normalize_key(cn["Model"])
+        table = table.drop(columns=["Model"])
+        on = ["_model_key", "_code_key"]
+
+    table = table[table["_code_key"] != ""]
+    dup = table.duplicated(subset=on)
+    table = table[~dup]
+
+    for col in table.columns:
+        if col not in on and table[col].dtype != "float64":
+            table[col] = table[col].astype("category")
+
+    left = parts.copy(deep=False)
+    left["_code_key"] = normalize_key(parts["Spare Part Code"])
+    if "_model_key" in on:
+        left["_model_key"] = normalize_key(parts["Model"])
+
+    merged = left.merge(
+        table,
+        on=on,
+        how="left",
+        suffixes=("", "_CN"),
+        validate="many_to_one",
+        indicator="_cn_match",
+    )
+
+    matched = merged["_cn_match"] == "both"
+    parts_keys = set(zip(*(left[c] for c in on)))
+    cn_unmatched = sum(k not in parts_keys for k in zip(*(table[c] for c in on)))
+    stats = {
+        "parts_rows": len(parts),
+        "matched_rows": int(matched.sum()),
+        "cn_rows": len(table),
+        "cn_unmatched": int(cn_unmatched),
+        "cn_duplicate_keys": int(dup.sum()),
+    }
+    print(
+        f"CN join: parts {stats['parts_rows']} แถว match {stats['matched_rows']} | "
+        f"CN {stats['cn_rows']} แถว ไม่พบใน parts {stats['cn_unmatched']} | "
+        f"key ซ้ำใน CN {stats['cn_duplicate_keys']}"
+    )
+
+    merged = merged.drop(columns=on + ["_cn_match"])
+    merged.attrs["cn_join"] = stats
+    return merged
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """คอลัมน์ object ที่ปนตัวเลขกับข้อความ (เช่น ราคา 85.51 กับ "核算中")
+    แปลงเป็นข้อความทั้งคอลัมน์ (คง NaN ไว้) เพื่อให้เขียน Parquet ได้
+    และให้ผลลัพธ์เหมือนกันไม่ว่าจะโหลดจาก Excel หรือจาก snapshot"""
+    df.columns = [str(c) for c in df.columns]
+    for col in df.columns:
+        s = df[col]
+        if s.dtype != object:
+            continue
+        kinds = {type(v) for v in s.dropna()}
+        if len(kinds) > 1 or (kinds and not kinds <= {str}):
+            df[col] = s.where(s.isna(), s.astype(str))
+    return df
+
+
+# =============================
+# COMPACT SCHEMA
+# =============================
+
+# คอลัมน์ที่ค่าซ้ำกันเยอะ (Model / Product Name ถูก ffill ทั้งบล็อก) -> categorical
+CATEGORICAL_COLS = [
+    "Category",
+    "Model",
+    "Product Name",
+    "Warranty Type",
+    "Replacement part/Wearing part",
+    "Remark",
+    "CN Product Name",
+    "CN Spare Part Name",
+    "Remark_CN",
+]
+
+# ราคาเก็บเป็นตัวเลข ข้อความที่ไม่ใช่ตัวเลข (เช่น "核算中" = กำลังคำนวณราคา) ย้ายไปคอลัมน์นี้
+PRICE_COL = "Unit Price (CNY)"
+PRICE_NOTE_COL = "Price Note"
+
+
+def _arrow_string_dtype():
+    """string แบบ Arrow ที่ใช้ NaN เป็นค่าว่าง (เหมือน str ของ pandas 3)"""
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:  # pandas < 2.3
+        return pd.StringDtype("pyarrow_numpy")
+
+
+def bytes_per_row(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)
+
+
+def compact_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """แปลง catalog เป็น dtype ที่กินหน่วยความจำน้อย
+
+    - คอลัมน์ใน CATEGORICAL_COLS -> category
+    - Unit Price (CNY) -> float64 (ข้อความย้ายไป Price Note แบบ category)
+    - คอลัมน์ข้อความที่เหลือ (รหัส / คำอธิบาย / Spare Parts Qty ที่เป็นข้อความอิสระ)
+      -> Arrow string
+    """
+    before = bytes_per_row(df)
+    out = df.copy()
+
+    if PRICE_COL in out.columns:
+        raw = out[PRICE_COL]
+        price = pd.to_numeric(raw, errors="coerce").astype("float64")
+        note = raw.where(price.isna() & raw.notna())
+        out[PRICE_COL] = price
+        out.insert(out.columns.get_loc(PRICE_COL) + 1, PRICE_NOTE_COL, note.astype("category"))
+
+    string_dtype = _arrow_string_dtype()
+    for col in out.columns:
+        if col in CATEGORICAL_COLS:
+            out[col] = out[col].astype("category")
+        elif out[col].dtype == object or pd.api.types.is_string_dtype(out[col]):
+            if not isinstance(out[col].dtype, pd.CategoricalDtype):
+                out[col] = out[col].astype(string_dtype)
+
+    print(f"catalog: {before:.0f} -> {bytes_per_row(out):.0f} bytes/แถว ({len(out)} แถว)")
+    out.attrs = dict(df.attrs)
+    return out
+
+
+# =============================
+# SNAPSHOT READ / WRITE
+# =============================
+
+def write_snapshot(df: pd.DataFrame, path: Path) -> None:
+    """เขียน snapshot แบบ atomic (เขียนไฟล์ชั่วคราวก่อนแล้วค่อย rename)
+    และลบ snapshot เวอร์ชันเก่าในโฟลเดอร์เดียวกันทิ้ง"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".parquet.tmp")
+    df.to_parquet(tmp, index=False)
+    tmp.replace(path)
+
+    for old in path.parent.glob("catalog-*.parquet"):
+        if old != path:
+            old.unlink(missing_ok=True)
+
+
+def load_catalog(base: Path, sheet_cache: dict | None = None) -> pd.DataFrame:
+    """โหลด catalog จาก snapshot ถ้า hash ของไฟล์ Excel ตรงกัน
+    ถ้าไม่ตรง (หรือยังไม่มี snapshot) ค่อยอ่าน Excel แล้วเขียน snapshot ใหม่
+
+    df.attrs["version"] = hash ของข้อมูล ใช้เป็น key ของ index ต่างๆ ที่สร้างจาก df
+    """
+    digest = source_hash(base)
+    snap = snapshot_path(base, digest)
+
+    df = None
+    if snap.exists():
+        try:
+            df = pd.read_parquet(snap)
+        except Exception as e:
+            print(f"อ่าน snapshot ไม่ได้ ({e}) -> อ่านจาก Excel แทน")
+
+    if df is None:
+        df = read_excel_sources(base, sheet_cache)
+        try:
+            write_snapshot(df, snap)
+        except OSError as e:
+            # เช่น deploy บน filesystem ที่เขียนไม่ได้ ก็ยังใช้งานต่อได้
+            print(f"เขียน snapshot ไม่ได้: {e}")
+
+    df.attrs["version"] = digest
+    return df
+
+
+# =============================
+# SHARED CATALOG (ทุก session ใช้ตัวเดียวกัน)
+# =============================
+
+class Catalog:
+    """catalog เวอร์ชันหนึ่งพร้อม index ทั้งหมด สร้างครั้งเดียวแล้วใช้ร่วมกันทุก session
+
+    ถือเป็น read-only: ห้ามแก้ df ตรงๆ ให้เลือกแถวด้วย df.iloc[positions]
+    ซึ่งได้ DataFrame ใหม่เฉพาะแถวที่ต้องการ ไม่ต้อง copy ทั้งตาราง
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.version = df.attrs.get("version", "")
+
+        self.code_index = CodeIndex(df["Spare Part Code"])
+        self.text_index = TextIndex(df)
+        self.model_catalog = ModelCatalog(df, self.text_index)
+        self.description_index = DescriptionIndex(df)
+
+        # คำแนะนำระหว่างพิมพ์ (รหัส / ชื่อรุ่น + ชื่อสินค้า)
+        self.code_prefixes = PrefixIndex(df["Spare Part Code"].unique())
+        self.product_prefixes = PrefixIndex(
+            [v for col in PRODUCT_FIELDS if col in df.columns for v in df[col].unique()],
+            word_starts=True,
+        )
+
+        rows_by_model: dict[str, list[int]] = {}
+        for pos, model in enumerate(df["Model"].tolist()):
+            if isinstance(model, str) and model.strip():
+                rows_by_model.setdefault(model.strip(), []).append(pos)
+        self._rows_by_model = rows_by_model
+
+        if "Category" in df.columns:
+            self.categories = sorted(
+                str(c).strip() for c in df["Category"].dropna().unique() if str(c).strip()
+            )
+        else:
+            self.categories = []
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def model_rows(self, model: str) -> list[int]:
+        """ตำแหน่งแถวของ Model ที่เลือกจาก dropdown"""
+        return list(self._rows_by_model.get(model.strip(), []))
+
+
+def _source_stat(base: Path):
+    """(mtime, size) ของไฟล์ต้นฉบับ ใช้เช็คเร็วๆ ว่าไฟล์เปลี่ยนหรือยังก่อนจะ hash จริง
+
+    คืน None ถ้า stat ไม่ได้ (เช่น Excel ลบไฟล์เดิมทิ้งชั่วครู่ระหว่างเซฟ)
+    """
+    stat = []
+    try:
+        for path in source_paths(base):
+            st = path.stat()
+            stat.append((st.st_mtime_ns, st.st_size))
+    except OSError:
+        return None
+    return tuple(stat)
+
+
+class CatalogStore:
+    """ถือ Catalog เวอร์ชันปัจจุบันของทั้ง process
+
+    current() คืนเวอร์ชันที่โหลดไว้ทันที (โหลดเองเฉพาะครั้งแรกที่ยังไม่มีอะไรเลย)
+    ไม่เช็คไฟล์และไม่โหลดใหม่บน thread ของ session
+
+    refresh() เช็คแค่ stat ของไฟล์ Excel (ไม่ copy / ไม่ hash) ถ้าไฟล์เปลี่ยนค่อยโหลดใหม่
+    แล้วสลับ reference ทีเดียว rerun ที่ถือ Catalog ตัวเก่าอยู่ก็ใช้ตัวเก่าต่อจนจบ
+    start_watcher() เปิด thread เรียก refresh() ทุก WATCH_INTERVAL วินาที ระหว่างโหลด
+    current() ยังคืนเวอร์ชันเดิม ไม่มี session ไหนต้องรอ
+    การโหลดใหม่ parse เฉพาะชีตที่ hash เปลี่ยน (จำชีตที่เคย parse ไว้ใน _sheet_cache)
+    ถ้าเริ่มจาก snapshot (ยังไม่เคย parse ชีตไหน) watcher เติม _sheet_cache ให้ในรอบแรก
+    """
+
+    def __init__(self, base: Path):
+        self.base = base
+        self._lock = threading.Lock()
+        self._stat = None
+        self._current: Catalog | None = None
+        self._sheet_cache: dict = {}
+        self._watcher: threading.Thread | None = None
+
+    def current(self) -> Catalog:
+        if self._current is None:
+            with self._lock:
+                if self._current is None:
+                    self._reload(_source_stat(self.base))
+        return self._current
+
+    def refresh(self) -> None:
+        """โหลดใหม่ถ้าไฟล์เปลี่ยนตั้งแต่รอบก่อน (watcher เรียก)"""
+        if self._current is None:
+            self.current()
+            return
+        stat = _source_stat(self.base)
+        if stat is None:
+            return  # ไฟล์หายชั่วคราวระหว่างเซฟ ก็รอรอบหน้า
+        if stat == self._stat:
+            if not self._sheet_cache:
+                self._seed_sheet_cache()
+            return
+
+        with self._lock:
+            if stat == self._stat:
+                return
+            try:
+                self._reload(stat)
+            except Exception as e:
+                # เช่น ไฟล์กำลังถูกเซฟอยู่ครึ่งๆ -> ใช้เวอร์ชันเดิมต่อ รอบหน้าค่อยลองใหม่
+                print(f"โหลด catalog ใหม่ไม่สำเร็จ ({e}) ใช้เวอร์ชันเดิมต่อ")
+
+    def _seed_sheet_cache(self) -> None:
+        """parse ทุกชีตของไฟล์ปัจจุบันเก็บไว้ใน _sheet_cache (ทิ้ง DataFrame ที่ได้)
+
+        catalog ที่โหลดจาก snapshot ไม่ได้ parse ชีตเลย ถ้าไม่เติมไว้ก่อน การแก้ไฟล์ครั้งแรก
+        จะต้อง parse ใหม่ทุกชีต
+        """
+        with self._lock:
+            if self._sheet_cache:
+                return
+            try:
+                read_combine_sheets(self.base / COMBINE_FILE, self._sheet_cache)
+            except Exception as e:
+                self._sheet_cache.clear()
+                print(f"เตรียม cache ของชีตไม่สำเร็จ ({e}) รอบหน้าลองใหม่")
+
+    def _reload(self, stat) -> None:
+        df = load_catalog(self.base, self._sheet_cache)
+        if self._current is None or df.attrs["version"] != self._current.version:
+            self._current = Catalog(df)
+            print(f"catalog เวอร์ชัน {self._current.version[:16]} ({len(df)} แถว)")
+        self._stat = stat
+
+    def start_watcher(self, interval: float = WATCH_INTERVAL) -> None:
+        """เปิด thread (daemon) คอยโหลด catalog ใหม่เมื่อไฟล์ Excel เปลี่ยน เรียกซ้ำได้"""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"watcher: {e}")
+
+        self._watcher = threading.Thread(target=watch, name="catalog-watcher", daemon=True)
+        self._watcher.start()
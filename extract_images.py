@@ -1,135 +1,87 @@
 from pathlib import Path
-from io import BytesIO
-
-from openpyxl import load_workbook
-from PIL import Image
-
+import argparse
+import hashlib
+import os
+
+from image_index import STORE_DIR
+from ingest import (
+    load_image_manifest,
+    make_thumbnails,
+    prune_store,
+    run,
+    write_image_manifest,
+)
+
+
+def extract_from_workbook(base: Path, workers: int | None = None):
+    """ดึงรูปที่ฝังใน Excel ตัวใหญ่ออกมาเก็บใน images/store/ แบบ content-addressed + รูปย่อ
+
+    ใช้ pipeline เดียวกับ ingest.py (อ่านแบบ read-only + อ่าน drawing ของแต่ละชีตจาก zip)
+    ถ้าจะได้ไฟล์ตัวผอม / snapshot ไปพร้อมกันในการอ่านครั้งเดียว ให้รัน ingest.py แทน
+    """
+    run(base, slim=False, images=True, snapshot=False, workers=workers)
+
+
+def migrate_existing(images_dir: Path):
+    """ย้ายรูปแบบเดิม (images/*.png, images/spare/*.png, images/product/*.png) เข้า store
+
+    ชื่อใน manifest ใช้ชื่อไฟล์เดิม (ไม่รวม .png) รูปที่ไฟล์เหมือนกันเหลือไฟล์เดียว
+    ชื่อที่มีใน manifest อยู่แล้ว (ดึงจาก Excel) ไม่ถูกทับ
+    """
+    store_dir = images_dir / STORE_DIR
+    store_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_image_manifest(images_dir)
+    existing = {kind: set(names) for kind, names in manifest.items()}
+
+    moved = 0
+    # images/{code}.png มาก่อน images/spare/{code}.png จึงย้าย images/ ทีหลังให้ทับ
+    for sub, kind in (("spare", "spare"), ("product", "product"), ("", "spare")):
+        src_dir = images_dir / sub if sub else images_dir
+        for src in sorted(src_dir.glob("*.png")):
+            digest = hashlib.sha256(src.read_bytes()).hexdigest()
+            target = store_dir / f"{digest}.png"
+            if target.exists():
+                src.unlink()
+            else:
+                os.replace(src, target)
+            if src.stem not in existing[kind]:
+                manifest[kind][src.stem] = f"{STORE_DIR}/{digest}.png"
+            moved += 1
 
-# ใช้ไฟล์ตัวเดียวกับที่แอปอ่านอยู่
-EXCEL_FILE = "Spare parts list for TOA- Combine.xlsx"
+    write_image_manifest(images_dir, manifest)
+    removed = prune_store(images_dir, manifest)
+    n_files = len(list(store_dir.glob("*.png")))
+    print(f"ย้ายรูปเดิม {moved} ไฟล์ -> {n_files} ไฟล์ใน {store_dir} (ลบไฟล์ที่ไม่ใช้แล้ว {removed})")
 
 
 def main():
-    base = Path(__file__).parent
-    xlsx_path = base / EXCEL_FILE
-
-    if not xlsx_path.exists():
-        print(f"ไม่พบไฟล์: {xlsx_path}")
-        return
-
-    print(f"โหลดไฟล์: {xlsx_path}")
-    wb = load_workbook(xlsx_path, data_only=True)
-
-    # โฟลเดอร์สำหรับเก็บรูป
-    images_dir = base / "images"
-    spare_dir = images_dir / "spare"
-    product_dir = images_dir / "product"
-    spare_dir.mkdir(parents=True, exist_ok=True)
-    product_dir.mkdir(parents=True, exist_ok=True)
-
-    for ws in wb.worksheets:
-        print(f"\n--- Sheet: {ws.title} ---")
-
-        HEADER_ROW = 2  # แถวที่มีหัวคอลัมน์จริง (Warranty, Model, Product Name, ...)
-
-        # map: column_index -> header text
-        headers = {}
-        for cell in ws[HEADER_ROW]:
-            if cell.value is not None:
-                headers[cell.column] = str(cell.value)
-
-        def find_col(keyword: str):
-            keyword = keyword.lower()
-            for col_idx, title in headers.items():
-                if keyword in str(title).lower():
-                    return col_idx
-            return None
-
-        col_code = find_col("spare part code")
-        col_model = find_col("model")
-        col_pname = find_col("product name")
-
-        print(
-            "คอลัมน์ที่ใช้:",
-            "Spare Part Code =", col_code,
-            "| Model =", col_model,
-            "| Product Name =", col_pname,
-        )
-
-        # ฟังก์ชันไล่ย้อนขึ้นไปหา Model / Product Name ที่ใกล้ที่สุดด้านบน
-        def get_model_pname(start_row: int):
-            for r in range(start_row, HEADER_ROW, -1):
-                model = ws.cell(row=r, column=col_model).value if col_model else None
-                pname = ws.cell(row=r, column=col_pname).value if col_pname else None
-                if (model and str(model).strip()) or (pname and str(pname).strip()):
-                    return model, pname
-            return None, None
+    parser = argparse.ArgumentParser(description="ดึงรูปจาก Excel และสร้างรูปย่อสำหรับแอป")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="จำนวน process ที่ใช้ decode / encode รูป (ค่าเริ่มต้น = จำนวน CPU, 1 = ไม่ใช้ pool)",
+    )
+    parser.add_argument(
+        "--migrate-existing",
+        action="store_true",
+        help="ย้ายรูปแบบเดิมใน images/, images/spare/, images/product/ เข้า images/store/",
+    )
+    parser.add_argument(
+        "--thumbs-only",
+        action="store_true",
+        help="ไม่ต้องอ่าน Excel สร้างเฉพาะรูปย่อจากรูปที่มีอยู่ใน images/",
+    )
+    args = parser.parse_args()
 
-        prod_count = 0
-        spare_count = 0
-
-        # loop รูปที่ฝังทั้งหมดในชีต
-        for img in getattr(ws, "_images", []):
-            anchor = img.anchor._from  # 0-based index
-            row = anchor.row + 1       # แปลงเป็น row แบบ Excel (เริ่มที่ 1)
-            col = anchor.col + 1
-
-            header_text = str(ws.cell(row=HEADER_ROW, column=col).value or "")
-            header_lower = header_text.lower()
-
-            # แปลงรูปจาก openpyxl เป็น PIL image
-            blob = img._data()
-            if callable(blob):
-                blob = blob()  # บางเวอร์ชัน _data() คืนฟังก์ชัน
-            try:
-                pil_img = Image.open(BytesIO(blob))
-            except Exception as e:
-                print(f"  ข้ามรูป (เปิดไม่ได้): row {row}, col {col}, error = {e}")
-                continue
-
-            # ---------- รูป Spare part ----------
-            if "spare" in header_lower:
-                if not col_code:
-                    continue
-                spare_code = ws.cell(row=row, column=col_code).value
-                if not spare_code:
-                    continue
-
-                filename = f"{str(spare_code).strip().replace('/', '_')}.png"
-                target = spare_dir / filename
-                pil_img.save(target)
-                spare_count += 1
-                # print(f"  [Spare]  row {row} -> {target.name}")
-
-            # ---------- รูป Product ----------
-            elif "product" in header_lower or ("picture" in header_lower and "spare" not in header_lower):
-                model, pname = get_model_pname(row)
-
-                base_name = None
-                if model and str(model).strip():
-                    base_name = str(model).strip()
-                elif pname and str(pname).strip():
-                    base_name = str(pname).strip()
-                else:
-                    # หา model/pname ไม่เจอ ข้าม
-                    continue
-
-                safe = "".join(ch if ch.isalnum() else "_" for ch in base_name)
-                filename = f"{safe}.png"
-                target = product_dir / filename
-                pil_img.save(target)
-                prod_count += 1
-                # print(f"  [Product] row {row} -> {target.name}")
-
-            # ไม่ใช่ Product / Spare ข้าม
-            else:
-                continue
-
-        print(f"เซฟรูป Product {prod_count} รูป | Spare {spare_count} รูป")
-
-    print("\nเสร็จแล้ว! รูปถูกเซฟไว้ที่โฟลเดอร์:")
-    print(f"  - {spare_dir}")
-    print(f"  - {product_dir}")
+    base = Path(__file__).parent
+    if args.migrate_existing:
+        migrate_existing(base / "images")
+        make_thumbnails(base / "images")
+    elif args.thumbs_only:
+        make_thumbnails(base / "images")
+    else:
+        extract_from_workbook(base, workers=args.workers)
 
 
 if __name__ == "__main__":
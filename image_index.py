@@ -0,0 +1,159 @@
+from pathlib import Path
+import json
+import os
+
+# รูปย่อที่ ingest.make_thumbnails สร้าง: images/thumbs/ + images/thumbs/manifest.json
+THUMB_DIR = "thumbs"
+THUMB_MANIFEST = "manifest.json"
+
+# รูปแบบ content-addressed ที่ ingest.py สร้าง: images/store/{sha256}.png
+# + images/image_manifest.json {"spare": {code: path}, "product": {model: path}}
+STORE_DIR = "store"
+IMAGE_MANIFEST = "image_manifest.json"
+
+
+def safe_filename(text: str) -> str:
+    """ชื่อไฟล์ของรูปแบบเดิมใน images/product/ (ตัวที่ไม่ใช่ตัวอักษร/ตัวเลข -> _)"""
+    return "".join(ch if ch.isalnum() else "_" for ch in text)
+
+
+def _scan_png(folder: Path) -> dict[str, str]:
+    """ชื่อไฟล์ (ไม่รวม .png) -> path ของไฟล์ .png ในโฟลเดอร์ (ไม่ลงโฟลเดอร์ย่อย)"""
+    found: dict[str, str] = {}
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.name.lower().endswith(".png") and entry.is_file():
+                    found[entry.name[:-4]] = (folder / entry.name).as_posix()
+    except FileNotFoundError:
+        pass
+    return found
+
+
+def _load_thumbs(images_dir: Path) -> dict[str, str]:
+    """path รูปต้นฉบับ -> path รูปย่อ จาก images/thumbs/manifest.json (ถ้ามี)"""
+    try:
+        with open(images_dir / THUMB_DIR / THUMB_MANIFEST, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+    thumbs = {}
+    for src, thumb in manifest.get("images", {}).items():
+        thumb_path = images_dir / thumb
+        if thumb_path.exists():
+            thumbs[(images_dir / src).as_posix()] = thumb_path.as_posix()
+    return thumbs
+
+
+def _load_store(images_dir: Path) -> tuple[dict[str, str], dict[str, str]]:
+    """(spare, product) ชื่อ -> path รูปใน store จาก images/image_manifest.json (ถ้ามี)"""
+    try:
+        with open(images_dir / IMAGE_MANIFEST, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}, {}
+
+    def resolve(names: dict) -> dict[str, str]:
+        return {name: (images_dir / rel).as_posix() for name, rel in names.items()}
+
+    return resolve(manifest.get("spare", {})), resolve(manifest.get("product", {}))
+
+
+class _ImageTables:
+    """ผลสแกนหนึ่งรอบ (ไม่แก้หลังสร้าง) ImageIndex แทนที่ทั้งก้อนด้วยการ assign ครั้งเดียว"""
+
+    def __init__(self, signature=None, spare=None, product=None, thumbs=None,
+                 store_spare=None, store_product=None):
+        self.signature = signature
+        self.spare: dict[str, str] = spare or {}
+        self.product: dict[str, str] = product or {}
+        self.thumbs: dict[str, str] = thumbs or {}
+        self.store_spare: dict[str, str] = store_spare or {}
+        self.store_product: dict[str, str] = store_product or {}
+
+
+class ImageIndex:
+    """สแกนโฟลเดอร์ images/ ครั้งเดียวแล้วเก็บเป็น dict
+
+    - store: ชื่อ -> รูปใน images/store/ จาก image_manifest.json (รูปเดียวกันหลายชื่อ
+      ได้ path เดียวกัน browser จึง cache ครั้งเดียว) มาก่อนรูปแบบเดิม
+    - spare: Spare Part Code -> รูป (images/{code}.png มาก่อน images/spare/{code}.png)
+    - product: ชื่อไฟล์ใน images/product/ -> รูป
+    - thumbs: รูปต้นฉบับ -> รูปย่อ (จาก manifest ที่ extract_images.py --thumbs-only สร้าง)
+
+    เช็คว่าต้องสแกนใหม่หรือไม่จาก mtime ของโฟลเดอร์ (เพิ่ม/ลบ/rename ไฟล์แล้ว mtime
+    ของโฟลเดอร์เปลี่ยน) จึงเหลือ stat แค่ไม่กี่ครั้งต่อ rerun แทนที่จะ stat ทุกการ์ด
+    """
+
+    def __init__(self, images_dir: Path):
+        self.images_dir = images_dir
+        self.spare_dir = images_dir / "spare"
+        self.product_dir = images_dir / "product"
+        self._tables = _ImageTables()
+        self.refresh()
+
+    def _current_signature(self):
+        sig = []
+        for folder in (self.images_dir, self.spare_dir, self.product_dir):
+            try:
+                sig.append(folder.stat().st_mtime_ns)
+            except FileNotFoundError:
+                sig.append(None)
+        for manifest in (Path(THUMB_DIR) / THUMB_MANIFEST, IMAGE_MANIFEST):
+            try:
+                sig.append((self.images_dir / manifest).stat().st_mtime_ns)
+            except FileNotFoundError:
+                sig.append(None)
+        return tuple(sig)
+
+    def refresh(self) -> bool:
+        """สแกนใหม่ถ้าโฟลเดอร์เปลี่ยน คืน True ถ้ามีการสแกนใหม่"""
+        sig = self._current_signature()
+        if sig == self._tables.signature:
+            return False
+
+        spare = _scan_png(self.spare_dir)
+        spare.update(_scan_png(self.images_dir))
+        store_spare, store_product = _load_store(self.images_dir)
+
+        # สร้างตารางชุดใหม่ให้ครบก่อนแล้วแทนที่ด้วย assign เดียว session อื่นที่อ่านอยู่
+        # จะเห็นชุดเก่าทั้งชุดหรือชุดใหม่ทั้งชุด ไม่มีครึ่งๆ กลางๆ
+        self._tables = _ImageTables(
+            signature=sig,
+            spare=spare,
+            product=_scan_png(self.product_dir),
+            thumbs=_load_thumbs(self.images_dir),
+            store_spare=store_spare,
+            store_product=store_product,
+        )
+        return True
+
+    def spare(self, code: str) -> str | None:
+        if not code:
+            return None
+        tables = self._tables
+        return tables.store_spare.get(code) or tables.spare.get(code)
+
+    def product(self, model: str, pname: str) -> str | None:
+        """หารูปสินค้าจาก model ตรงตัว -> model แบบ safe -> product name (ตรงตัว / แบบ safe)
+        ดูใน store ก่อน แล้วค่อยดูรูปแบบเดิมใน images/product/"""
+        names = []
+        if model:
+            names += [model, safe_filename(model)]
+        if pname:
+            names += [pname, safe_filename(pname)]
+
+        tables = self._tables
+        for table in (tables.store_product, tables.product):
+            for name in names:
+                src = table.get(name)
+                if src:
+                    return src
+        return None
+
+    def thumb(self, src: str | None) -> str | None:
+        """รูปย่อของรูปต้นฉบับ ถ้ายังไม่ได้สร้างรูปย่อก็คืนรูปต้นฉบับ"""
+        if not src:
+            return src
+        return self._tables.thumbs.get(src, src)
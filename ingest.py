@@ -0,0 +1,678 @@
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from itertools import chain
+from pathlib import Path
+from xml.etree import ElementTree
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+import unicodedata
+import zipfile
+
+from PIL import Image, features
+
+from image_index import IMAGE_MANIFEST, STORE_DIR, THUMB_DIR, THUMB_MANIFEST
+
+try:
+    import resource
+except ImportError:  # Windows ไม่มี resource ใช้ tracemalloc แทน
+    resource = None
+
+
+# =============================
+# CONFIG
+# =============================
+
+# ไฟล์ต้นฉบับตัวใหญ่ (มีรูปฝัง) และไฟล์ตัวผอมที่แอปอ่าน
+SOURCE_FILE = "Spare parts list for TOA- Combine.xlsx"
+SLIM_FILE = "Spare parts list for TOA- Combine_DATA.xlsx"
+IMAGES_DIR = "images"
+
+# หา header ในกี่แถวแรก (ไฟล์ต้นฉบับมีแถวชื่อตารางก่อน header ไฟล์ตัวผอมไม่มี)
+HEADER_SCAN_ROWS = 10
+
+RENAME_MAP = {
+    "Spare part code": "Spare Part Code",
+    "Spare part code ": "Spare Part Code",
+    "Spare Part code": "Spare Part Code",
+    "Spare part Code": "Spare Part Code",
+    "Description": "Description (EN)",
+    "Description（Thai）": "Description (TH)",
+    "Description(Thai)": "Description (TH)",
+    "Description （Thai）": "Description (TH)",
+    "Description（Chinese）": "Description (CN)",
+    "Description(Chinese)": "Description (CN)",
+    "Description （Chinese）": "Description (CN)",
+    "Picture（Product）": "Product Image",
+    "Picture( Product )": "Product Image",
+    "Picture （Product）": "Product Image",
+    "Picture\n（Spare part）": "Spare Image",
+    "Picture( Spare part )": "Spare Image",
+    "Picture （Spare part）": "Spare Image",
+    "Waranty": "Warranty Type",
+    "Warranty": "Warranty Type",
+    "Unit Price\n(CNY)": "Unit Price (CNY)",
+    "Unit Price (CNY)": "Unit Price (CNY)",
+    "Spare parts quantity": "Spare Parts Qty",
+}
+
+# คอลัมน์ที่ต้องเติมค่าจากบรรทัดบนลงมา (ใน Excel merge cell ไว้ทั้งบล็อก)
+FFILL_COLS = ("Model", "Product Name")
+
+# รูปย่อสำหรับการ์ด (แอปแสดงรูปในคอลัมน์แคบๆ ไม่ต้องส่งรูปเต็มไปทุกครั้ง)
+THUMB_WIDTH = 360
+THUMB_FORMAT = "WEBP" if features.check("webp") else "JPEG"
+
+
+# =============================
+# HEADER / ROWS (ใช้ร่วมกันทั้งการอ่าน catalog, ไฟล์ตัวผอม และการจับคู่รูป)
+# =============================
+
+def cell_value(v):
+    """แปลงค่าจาก openpyxl ให้เหมือน pd.read_excel: ว่าง -> None, float ที่เป็นจำนวนเต็ม -> int"""
+    if v is None:
+        return None
+    if isinstance(v, str):
+        return v if v != "" else None
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return v
+
+
+_HEADER_SPACE_RE = re.compile(r"\s*([()])\s*|\s+")
+
+
+def _header_key(title: str) -> str:
+    """NFKC (（Thai） -> (Thai)) + casefold + ตัดช่องว่างรอบวงเล็บ / ยุบช่องว่างและขึ้นบรรทัด"""
+    text = unicodedata.normalize("NFKC", title).casefold().strip()
+    return _HEADER_SPACE_RE.sub(lambda m: m.group(1) or " ", text)
+
+
+_RENAME_BY_KEY = {_header_key(k): v for k, v in RENAME_MAP.items()}
+
+
+def header_name(title) -> str:
+    """ชื่อคอลัมน์มาตรฐานของ header ในไฟล์ (สะกด / วงเล็บ full-width ต่างกันได้) ไม่รู้จักใช้ตามไฟล์"""
+    title = str(title)
+    return RENAME_MAP.get(title) or _RENAME_BY_KEY.get(_header_key(title), title)
+
+
+def is_picture_col(name: str) -> bool:
+    return "picture" in name.lower() or "รูป" in name
+
+
+class SheetLayout:
+    """header ของชีตหนึ่ง: แถวที่เป็น header และคอลัมน์ที่เก็บ (rename แล้ว)
+
+    - header_row: เลขแถวแบบ Excel (เริ่มที่ 1)
+    - columns: [(ตำแหน่งคอลัมน์ 0-based, ชื่อหลัง rename)] ตัด header ว่าง / ซ้ำ / คอลัมน์รูป
+    - raw: ตำแหน่งคอลัมน์ -> header ตามไฟล์ (ตัวเล็ก) ใช้แยกว่ารูปอยู่คอลัมน์ Spare / Product
+    """
+
+    def __init__(self, header_row: int, header: tuple):
+        self.header_row = header_row
+        self.columns: list[tuple[int, str]] = []
+        self.raw: dict[int, str] = {}
+        self.dropped: list[str] = []
+
+        seen = set()
+        for idx, title in enumerate(header):
+            if title is None:
+                continue
+            self.raw[idx] = str(title).lower()
+            name = header_name(title)
+            if name in seen:
+                continue
+            seen.add(name)
+            if is_picture_col(name):
+                self.dropped.append(name)
+                continue
+            self.columns.append((idx, name))
+
+        self.names = [name for _, name in self.columns]
+
+    def position(self, name: str) -> int | None:
+        """ตำแหน่งของคอลัมน์ name ใน list ค่าที่ iter_sheet_rows คืน"""
+        try:
+            return self.names.index(name)
+        except ValueError:
+            return None
+
+
+def _is_header(row: tuple) -> bool:
+    return any(
+        v is not None and header_name(v) == "Spare Part Code"
+        for v in row
+    )
+
+
+def iter_sheet_rows(ws):
+    """(layout, แถวข้อมูล) ของชีต อ่านแบบ read-only ทีละแถว
+
+    header คือแถวแรก (ใน HEADER_SCAN_ROWS แถว) ที่มีคอลัมน์ Spare Part Code
+    ถ้าไม่มีใช้แถวแรกที่ไม่ว่าง แถวข้อมูลเป็น (เลขแถว Excel, list ค่าตาม layout.columns)
+    ตัดแถวที่ว่างทั้งแถว แล้วเติม Model / Product Name จากบรรทัดบนลงมา
+    ชีตที่ไม่มี header ได้ (None, แถวว่าง)
+    """
+    if hasattr(ws, "reset_dimensions"):
+        ws.reset_dimensions()
+    rows = ws.iter_rows(values_only=True)
+
+    scanned = []
+    for row in rows:
+        scanned.append(row)
+        if _is_header(row) or len(scanned) >= HEADER_SCAN_ROWS:
+            break
+
+    header_at = next((i for i, row in enumerate(scanned) if _is_header(row)), None)
+    if header_at is None:
+        header_at = next((i for i, row in enumerate(scanned) if any(v is not None for v in row)), None)
+    if header_at is None:
+        return None, iter(())
+
+    layout = SheetLayout(header_at + 1, scanned[header_at])
+    body = chain(scanned[header_at + 1:], rows)
+    return layout, _data_rows(layout, body)
+
+
+def _data_rows(layout: SheetLayout, body):
+    ffill = [(i, name) for i, (_, name) in enumerate(layout.columns) if name in FFILL_COLS]
+    last = {name: None for _, name in ffill}
+    for excel_row, row in enumerate(body, start=layout.header_row + 1):
+        values = [
+            cell_value(row[idx]) if idx < len(row) else None
+            for idx, _ in layout.columns
+        ]
+        # ลบแถวที่ว่างทั้งแถว
+        if all(v is None for v in values):
+            continue
+        for i, name in ffill:
+            if values[i] is None:
+                values[i] = last[name]
+            else:
+                last[name] = values[i]
+        yield excel_row, values
+
+
+def read_sheet_columns(ws) -> tuple[dict[str, list], int]:
+    """อ่านชีตเดียวเป็น dict ชื่อคอลัมน์ -> list ค่า (ชื่อชีตคือ Category จึงไม่เก็บคอลัมน์ Category)"""
+    layout, rows = iter_sheet_rows(ws)
+    if layout is None:
+        return {}, 0
+
+    keep = [(i, name) for i, name in enumerate(layout.names) if name != "Category"]
+    columns: dict[str, list] = {name: [] for _, name in keep}
+    n_rows = 0
+    for _, values in rows:
+        for i, name in keep:
+            columns[name].append(values[i])
+        n_rows += 1
+    return columns, n_rows
+
+
+# =============================
+# WORKBOOK PARTS (อ่านจาก zip ตรงๆ ไม่ต้องโหลดทั้ง workbook)
+# =============================
+
+_NS = {
+    "m": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+
+
+def _part_path(base_part: str, target: str) -> str:
+    """แปลง Target ใน .rels (relative กับไฟล์ base_part) เป็น path ใน zip"""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    parts = base_part.split("/")[:-1]
+    for piece in target.split("/"):
+        if piece == "..":
+            parts.pop()
+        elif piece != ".":
+            parts.append(piece)
+    return "/".join(parts)
+
+
+def _rels(zf: zipfile.ZipFile, part: str) -> list[tuple[str, str, str]]:
+    """(Id, Type, path ใน zip) ของ relationship ของ part นั้น"""
+    folder, _, name = part.rpartition("/")
+    rels_part = f"{folder}/_rels/{name}.rels"
+    try:
+        tree = ElementTree.fromstring(zf.read(rels_part))
+    except KeyError:
+        return []
+    return [
+        (rel.get("Id"), rel.get("Type", ""), _part_path(part, rel.get("Target", "")))
+        for rel in tree.findall("rel:Relationship", _NS)
+        if rel.get("TargetMode") != "External"
+    ]
+
+
+def sheet_parts(zf: zipfile.ZipFile) -> dict[str, str]:
+    """ชื่อชีต -> path ของ XML ชีตใน zip ตามลำดับชีตใน workbook"""
+    targets = {rid: path for rid, _, path in _rels(zf, "xl/workbook.xml")}
+    workbook = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    return {
+        sheet.get("name"): targets.get(sheet.get(f"{{{_NS['r']}}}id"), "")
+        for sheet in workbook.findall("m:sheets/m:sheet", _NS)
+    }
+
+
+def sheet_images(zf: zipfile.ZipFile, sheet_part: str) -> list[tuple[int, int, bytes]]:
+    """รูปที่ฝังในชีต: (แถว Excel, คอลัมน์ Excel, blob) จากมุมซ้ายบนของรูป
+
+    ใช้ตัวอ่าน drawing ของ openpyxl ตัวเดียวกับที่ load_workbook แบบเต็มใช้ทำ ws._images
+    แต่อ่านเฉพาะ drawing ของชีตนี้ ไม่ต้องโหลดเซลล์ทั้ง workbook
+    """
+    from openpyxl.reader.drawings import find_images
+
+    found = []
+    for _, rel_type, path in _rels(zf, sheet_part):
+        if not rel_type.endswith("/drawing"):
+            continue
+        _, images = find_images(zf, path)
+        for img in images:
+            anchor = img.anchor._from  # 0-based index
+            blob = img._data()
+            if callable(blob):
+                blob = blob()  # บางเวอร์ชัน _data() คืนฟังก์ชัน
+            found.append((anchor.row + 1, anchor.col + 1, blob))
+    return found
+
+
+class SheetImages:
+    """จับคู่รูปของชีตกับชื่อไประหว่างไล่แถว (ป้อนแถวข้อมูลตามลำดับผ่าน feed() แล้วเรียก finish())
+
+    - รูปในคอลัมน์ spare: Spare Part Code ของแถวเดียวกับรูป
+    - รูปในคอลัมน์ product / picture: Model (ไม่มีใช้ Product Name) ของแถวล่าสุดที่ไม่ว่าง
+      ณ แถวของรูป (ค่า ffill แล้ว) แทนการไล่ย้อนขึ้นไปทีละแถวต่อรูป
+
+    finish() คืน ("spare", code) / ("product", model) -> blob ชื่อซ้ำใช้รูปหลังสุด
+    """
+
+    def __init__(self, layout: SheetLayout, images: list[tuple[int, int, bytes]]):
+        self._pending = sorted(images, key=lambda im: im[0])
+        self._next = 0
+        self._pos_code = layout.position("Spare Part Code")
+        self._pos_model = layout.position("Model")
+        self._pos_pname = layout.position("Product Name")
+        self._raw = layout.raw
+        self._last_row = None
+        self._last_values = None
+        self.jobs: dict[tuple[str, str], bytes] = {}
+
+    def _value(self, pos):
+        if pos is None or self._last_values is None:
+            return None
+        v = self._last_values[pos]
+        return str(v).strip() if v is not None and str(v).strip() else None
+
+    def _resolve(self, row: int, col: int, blob: bytes):
+        header_lower = self._raw.get(col - 1, "")
+
+        # ---------- รูป Spare part ----------
+        if "spare" in header_lower:
+            # รหัสต้องอยู่ในแถวเดียวกับรูป
+            code = self._value(self._pos_code) if self._last_row == row else None
+            if not code:
+                return
+            name = ("spare", code)
+
+        # ---------- รูป Product ----------
+        elif "product" in header_lower or "picture" in header_lower:
+            base_name = self._value(self._pos_model) or self._value(self._pos_pname)
+            if not base_name:
+                # หา model/pname ไม่เจอ ข้าม
+                return
+            name = ("product", base_name)
+
+        # ไม่ใช่ Product / Spare ข้าม
+        else:
+            return
+        self.jobs[name] = blob
+
+    def feed(self, excel_row: int, values: list):
+        pending = self._pending
+        while self._next < len(pending) and pending[self._next][0] < excel_row:
+            self._resolve(*pending[self._next])
+            self._next += 1
+        self._last_row, self._last_values = excel_row, values
+
+    def finish(self) -> dict[tuple[str, str], bytes]:
+        for image in self._pending[self._next:]:
+            self._resolve(*image)
+        self._next = len(self._pending)
+        return self.jobs
+
+
+# =============================
+# IMAGE STORE (content-addressed: images/store/{sha256}.png + image_manifest.json)
+# =============================
+
+def _save_png(blob: bytes, target: str) -> str | None:
+    """decode รูปจาก Excel แล้วเซฟเป็น PNG (รันใน process pool) คืนข้อความ error ถ้าเปิดไม่ได้
+
+    เขียนลงไฟล์ชั่วคราวก่อนแล้วค่อย rename ไฟล์ที่ชื่อเป็น hash จึงไม่มีทางเป็นไฟล์ครึ่งๆ กลางๆ
+    """
+    tmp = f"{target}.tmp"
+    try:
+        with Image.open(BytesIO(blob)) as pil_img:
+            pil_img.save(tmp, "PNG")
+        os.replace(tmp, target)
+    except Exception as e:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return str(e)
+    return None
+
+
+def load_image_manifest(images_dir: Path) -> dict[str, dict[str, str]]:
+    try:
+        with open(images_dir / IMAGE_MANIFEST, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    return {kind: dict(manifest.get(kind, {})) for kind in ("spare", "product")}
+
+
+def write_image_manifest(images_dir: Path, manifest: dict[str, dict[str, str]]):
+    tmp = images_dir / f"{IMAGE_MANIFEST}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, images_dir / IMAGE_MANIFEST)
+
+
+def prune_store(images_dir: Path, manifest: dict[str, dict[str, str]]) -> int:
+    """ลบไฟล์ใน store ที่ไม่มีชื่อไหนใช้แล้ว คืนจำนวนไฟล์ที่ลบ"""
+    used = {rel for names in manifest.values() for rel in names.values()}
+    removed = 0
+    for path in (images_dir / STORE_DIR).glob("*.png"):
+        if f"{STORE_DIR}/{path.name}" not in used:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+class ImageStore:
+    """เขียนรูปลง images/store/ ทีละชีต แล้ว close() เขียน manifest + ลบไฟล์ที่ไม่ใช้
+
+    รูปที่ hash ตรงกับไฟล์ใน store อยู่แล้ว (รันรอบก่อน หรือรูปเดียวกันที่ใช้หลายชื่อ)
+    ไม่ต้อง decode / encode ใหม่ ที่เหลือแบ่งให้ process pool ทำพร้อมกัน
+    """
+
+    def __init__(self, images_dir: Path, workers: int | None = None):
+        self.images_dir = images_dir
+        self.store_dir = images_dir / STORE_DIR
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest: dict[str, dict[str, str]] = {"spare": {}, "product": {}}
+        self._failed: set[str] = set()
+
+        # เครื่อง CPU เดียวไม่ต้องเปิด pool (ส่ง blob ข้าม process มีแต่เสียเวลาเปล่า)
+        workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    def add(self, jobs: dict[tuple[str, str], bytes]) -> int:
+        """เพิ่มรูปของชีตหนึ่ง คืนจำนวนรูปที่ encode ใหม่"""
+        pending: dict[str, bytes] = {}  # hash -> blob ของรูปที่ยังไม่มีใน store
+        for (kind, name), blob in jobs.items():
+            digest = hashlib.sha256(blob).hexdigest()
+            self.manifest[kind][name] = f"{STORE_DIR}/{digest}.png"
+            if digest not in pending and not (self.store_dir / f"{digest}.png").exists():
+                pending[digest] = blob
+
+        digests = list(pending)
+        targets = [str(self.store_dir / f"{d}.png") for d in digests]
+        if self._pool is not None:
+            errors = self._pool.map(_save_png, pending.values(), targets, chunksize=16)
+        else:
+            errors = map(_save_png, pending.values(), targets)
+
+        for digest, error in zip(digests, errors):
+            if error:
+                print(f"  ข้ามรูป (เปิดไม่ได้): {digest[:12]}, error = {error}")
+                self._failed.add(f"{STORE_DIR}/{digest}.png")
+        return len(pending)
+
+    def shutdown(self):
+        """ปิด process pool (เรียกซ้ำได้) ไม่แตะ manifest"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def close(self) -> int:
+        """เขียน image_manifest.json แล้วลบไฟล์ที่ไม่มีชื่อไหนใช้ คืนจำนวนไฟล์ที่ลบ
+
+        เรียกเฉพาะเมื่ออ่านครบทุกชีตแล้ว ถ้าพังกลางทาง manifest ใหม่ยังไม่ครบ
+        จะทำให้ชื่อ / ไฟล์รูปของชีตที่ยังไม่ได้อ่านถูกลบทิ้ง
+        """
+        self.shutdown()
+        for names in self.manifest.values():
+            for name in [n for n, rel in names.items() if rel in self._failed]:
+                del names[name]
+
+        write_image_manifest(self.images_dir, self.manifest)
+        return prune_store(self.images_dir, self.manifest)
+
+
+def make_thumbnails(images_dir: Path):
+    """สร้างรูปย่อ (กว้างไม่เกิน THUMB_WIDTH) ของทุก .png ใน images/, images/spare/,
+    images/product/, images/store/ ไว้ที่ images/thumbs/ พร้อม manifest.json
+    (รูปต้นฉบับ -> รูปย่อ)
+
+    ข้ามรูปที่รูปย่อใหม่กว่าต้นฉบับอยู่แล้ว จึงรันซ้ำได้เร็ว รูปย่อที่ไม่มีต้นฉบับแล้วถูกลบ
+    """
+    thumbs_dir = images_dir / THUMB_DIR
+    ext = ".webp" if THUMB_FORMAT == "WEBP" else ".jpg"
+
+    manifest = {}
+    made = skipped = 0
+    src_bytes = thumb_bytes = 0
+
+    for sub in ["", "spare", "product", STORE_DIR]:
+        src_dir = images_dir / sub if sub else images_dir
+        out_dir = thumbs_dir / sub if sub else thumbs_dir
+        if not src_dir.is_dir():
+            continue
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+        for src in sorted(src_dir.glob("*.png")):
+            target = out_dir / f"{src.stem}{ext}"
+            if not target.exists() or target.stat().st_mtime < src.stat().st_mtime:
+                with Image.open(src) as im:
+                    im.thumbnail((THUMB_WIDTH, THUMB_WIDTH * 4))
+                    if THUMB_FORMAT == "JPEG" and im.mode != "RGB":
+                        im = im.convert("RGB")
+                    im.save(target, THUMB_FORMAT, quality=80)
+                made += 1
+            else:
+                skipped += 1
+
+            manifest[src.relative_to(images_dir).as_posix()] = (
+                target.relative_to(images_dir).as_posix()
+            )
+            src_bytes += src.stat().st_size
+            thumb_bytes += target.stat().st_size
+
+    used = set(manifest.values())
+    removed = 0
+    for path in thumbs_dir.rglob(f"*{ext}"):
+        if path.relative_to(images_dir).as_posix() not in used:
+            path.unlink()
+            removed += 1
+
+    with open(thumbs_dir / THUMB_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(
+            {"width": THUMB_WIDTH, "format": THUMB_FORMAT, "images": manifest},
+            f,
+            ensure_ascii=False,
+            indent=1,
+        )
+
+    print(
+        f"รูปย่อ: สร้างใหม่ {made} | ข้าม (ล่าสุดแล้ว) {skipped} | ลบ {removed} | "
+        f"ต้นฉบับ {src_bytes / 1e6:.1f} MB -> รูปย่อ {thumb_bytes / 1e6:.1f} MB"
+    )
+
+
+# =============================
+# PIPELINE: อ่านไฟล์ต้นฉบับครั้งเดียว -> ไฟล์ตัวผอม / รูป / snapshot
+# =============================
+
+def _peak_memory_mb() -> float:
+    """peak memory ของ process (MB): ru_maxrss บน Linux / macOS, ที่อื่นใช้ tracemalloc"""
+    if resource is None:
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def run(
+    base: Path,
+    slim: bool = True,
+    images: bool = True,
+    snapshot: bool = True,
+    workers: int | None = None,
+) -> bool:
+    """อ่านไฟล์ต้นฉบับ (SOURCE_FILE) ครั้งเดียวแบบ read-only ทีละชีตทีละแถว แล้วส่งต่อให้
+
+    - slim: เขียนไฟล์ตัวผอม (SLIM_FILE) แบบ write-only ทีละแถว
+    - images: เก็บรูปที่ฝังในชีตลง images/store/ + manifest แล้วสร้างรูปย่อ
+    - snapshot: สร้าง snapshot (Parquet) ที่แอปโหลดได้ทันที จากคอลัมน์ที่อ่านมาแล้ว
+      (ต้องเขียนไฟล์ตัวผอมด้วย เพราะ key ของ snapshot คือ hash ของไฟล์ตัวผอม)
+
+    คืน False ถ้าไม่มีไฟล์ต้นฉบับหรือไม่มีข้อมูลเลย
+    """
+    from openpyxl import Workbook, load_workbook
+
+    src = base / SOURCE_FILE
+    if not src.exists():
+        print(f"ไม่พบไฟล์ต้นฉบับ: {src}")
+        return False
+    snapshot = snapshot and slim
+
+    if resource is None:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    print(f"อ่านไฟล์ต้นฉบับ: {src}")
+
+    # read-only: ไม่โหลดรูปที่ฝังอยู่ และอ่านทีละแถวจาก XML ไม่ต้องโหลดทั้งชีต
+    wb = load_workbook(src, read_only=True, data_only=True)
+    zf = zipfile.ZipFile(src) if images else None
+    parts = sheet_parts(zf) if images else {}
+    # write-only: แถวที่ append ถูกเขียนลงไฟล์ชั่วคราวของชีตทันที
+    out = Workbook(write_only=True) if slim else None
+    store = ImageStore(base / IMAGES_DIR, workers) if images else None
+
+    pieces = []
+    try:
+        for ws in wb.worksheets:
+            print(f"  >> ชีต: {ws.title}")
+            t_sheet = time.perf_counter()
+
+            layout, rows = iter_sheet_rows(ws)
+            if layout is None:
+                print("     - ข้าม (ไม่พบ header)")
+                continue
+            if layout.dropped:
+                print(f"     - ลบคอลัมน์รูป: {layout.dropped}")
+
+            matcher = SheetImages(layout, sheet_images(zf, parts[ws.title])) if images else None
+            keep = [(i, name) for i, name in enumerate(layout.names) if name != "Category"]
+            columns: dict[str, list] = {name: [] for _, name in keep} if snapshot else {}
+            out_ws = None
+            n_rows = 0
+            for excel_row, values in rows:
+                if out is not None:
+                    if out_ws is None:
+                        out_ws = out.create_sheet(ws.title)
+                        out_ws.append(layout.names)
+                    out_ws.append(values)
+                if snapshot:
+                    for i, name in keep:
+                        columns[name].append(values[i])
+                if matcher is not None:
+                    matcher.feed(excel_row, values)
+                n_rows += 1
+
+            info = f"{n_rows} แถว"
+            if matcher is not None:
+                jobs = matcher.finish()
+                encoded = store.add(jobs)
+                info += f" | รูป {len(jobs)} ชื่อ, encode ใหม่ {encoded}"
+            print(f"     - {info} ({time.perf_counter() - t_sheet:.2f}s)")
+
+            if n_rows:
+                pieces.append((ws.title, columns, n_rows))
+    finally:
+        wb.close()
+        if zf is not None:
+            zf.close()
+        if store is not None:
+            store.shutdown()
+
+    if store is not None:
+        removed = store.close()
+        n_names = sum(len(names) for names in store.manifest.values())
+        n_files = len(list(store.store_dir.glob("*.png")))
+        print(f"รูป: {n_names} ชื่อ -> {n_files} ไฟล์ใน {store.store_dir} (ลบไฟล์ที่ไม่ใช้แล้ว {removed})")
+        make_thumbnails(base / IMAGES_DIR)
+
+    if not pieces:
+        print("ไม่พบชีตที่ใช้ได้เลย")
+        return False
+
+    if out is not None:
+        out.save(base / SLIM_FILE)
+        print(f"บันทึกไฟล์ตัวผอม: {base / SLIM_FILE}")
+
+    if snapshot:
+        from catalog import (
+            CN_FILE,
+            combine_sheet_columns,
+            merge_sources,
+            snapshot_path,
+            source_hash,
+            write_snapshot,
+        )
+
+        # สร้าง snapshot จากคอลัมน์ที่อ่านมาแล้ว ไม่ต้องเปิดไฟล์ตัวผอมอ่านซ้ำ
+        df = merge_sources(combine_sheet_columns(pieces), base / CN_FILE)
+        snap = snapshot_path(base, source_hash(base))
+        write_snapshot(df, snap)
+        print(f"บันทึก snapshot: {snap}")
+
+    print(f"เสร็จแล้ว ✅  ({time.perf_counter() - t0:.1f}s, peak memory {_peak_memory_mb():.0f} MB)")
+    return True
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="อ่านไฟล์ Excel ต้นฉบับครั้งเดียว -> ไฟล์ตัวผอม + รูป + snapshot ของแอป"
+    )
+    parser.add_argument("--no-images", action="store_true", help="ไม่ต้องดึงรูป")
+    parser.add_argument("--no-snapshot", action="store_true", help="ไม่ต้องสร้าง snapshot")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="จำนวน process ที่ใช้ decode / encode รูป (ค่าเริ่มต้น = จำนวน CPU, 1 = ไม่ใช้ pool)",
+    )
+    args = parser.parse_args()
+
+    run(
+        Path(__file__).parent,
+        images=not args.no_images,
+        snapshot=not args.no_snapshot,
+        workers=args.workers,
+    )
+
+
+if __name__ == "__main__":
+    main()
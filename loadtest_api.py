@@ -0,0 +1,147 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlencode, urlsplit
+import argparse
+import http.client
+import json
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from catalog import CatalogStore
+
+
+# =============================
+# CONFIG
+# =============================
+
+DEFAULT_PORT = 8601
+DEFAULT_REQUESTS = 2000
+DEFAULT_CONCURRENCY = 32
+
+
+def build_requests(n: int, seed: int = 0) -> list[tuple[str, str, str, bytes | None]]:
+    """สุ่ม request ผสมทุก endpoint จากข้อมูลจริงใน catalog: (ชื่อ, method, path, body)"""
+    catalog = CatalogStore(Path(__file__).parent).current()
+    df = catalog.df
+    codes = [c for c in df["Spare Part Code"].dropna().unique().tolist() if c]
+    models = [m for _, m in catalog.model_catalog.options("", "")]
+    words = ["toilet", "smart", "basin", "faucet", "x70", "ts3", "shower", "cabinet"]
+
+    rng = random.Random(seed)
+    reqs = []
+    for _ in range(n):
+        kind = rng.choice(["code", "partial", "models", "model-parts", "search", "batch"])
+        if kind == "code":
+            reqs.append((kind, "GET", "/api/parts?" + urlencode({"code": rng.choice(codes)}), None))
+        elif kind == "partial":
+            code = rng.choice(codes)
+            reqs.append((kind, "GET", "/api/parts?" + urlencode({"code": code[:4], "exact": 0}), None))
+        elif kind == "models":
+            reqs.append((kind, "GET", "/api/models?" + urlencode({"q": rng.choice(words)}), None))
+        elif kind == "model-parts":
+            reqs.append((kind, "GET", "/api/model-parts?" + urlencode({"model": rng.choice(models)}), None))
+        elif kind == "search":
+            reqs.append((kind, "GET", "/api/search?" + urlencode({"q": rng.choice(words)}), None))
+        else:
+            body = json.dumps({"codes": rng.sample(codes, 50)}).encode()
+            reqs.append((kind, "POST", "/api/batch", body))
+    return reqs
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def run_load(base_url: str, reqs, concurrency: int) -> dict[str, list[float]]:
+    """ยิง request พร้อมกัน concurrency ตัว (1 keep-alive connection ต่อ thread)"""
+    url = urlsplit(base_url)
+    local = threading.local()
+    headers = {"Content-Type": "application/json"}
+
+    def fetch(req):
+        kind, method, path, body = req
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+        t0 = time.perf_counter()
+        conn.request(method, path, body=body, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        elapsed = time.perf_counter() - t0
+        if resp.status != 200:
+            print(f"  {kind} {path} -> HTTP {resp.status}")
+            return kind, None
+        return kind, elapsed
+
+    latencies: dict[str, list[float]] = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for kind, elapsed in pool.map(fetch, reqs):
+            if elapsed is not None:
+                latencies.setdefault(kind, []).append(elapsed)
+    return latencies
+
+
+def wait_ready(base_url: str, timeout: float = 60.0):
+    url = urlsplit(base_url)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = http.client.HTTPConnection(url.hostname, url.port, timeout=2)
+            conn.request("GET", "/api/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{base_url} ไม่ตอบภายใน {timeout:.0f} วินาที")
+        time.sleep(0.2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="load test ของ api.py วัด p50 / p99 ต่อ endpoint")
+    parser.add_argument("--url", help="ใช้ server ที่รันอยู่แล้ว (ไม่ระบุ = เปิด api.py ให้เอง)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-n", "--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args()
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        base_url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen(
+            [sys.executable, str(Path(__file__).parent / "api.py"), "--port", str(args.port)],
+            stdout=subprocess.DEVNULL,
+        )
+
+    try:
+        wait_ready(base_url)
+        reqs = build_requests(args.requests)
+
+        t0 = time.perf_counter()
+        latencies = run_load(base_url, reqs, args.concurrency)
+        elapsed = time.perf_counter() - t0
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    done = sum(len(v) for v in latencies.values())
+    print(f"\n{done} requests / {elapsed:.2f}s ({done / elapsed:.0f} req/s), concurrency {args.concurrency}")
+    print(f"{'endpoint':<12} {'n':>6} {'p50 ms':>8} {'p99 ms':>8}")
+    everything = []
+    for kind in sorted(latencies):
+        values = latencies[kind]
+        everything.extend(values)
+        print(f"{kind:<12} {len(values):>6} {percentile(values, 50) * 1e3:>8.2f} {percentile(values, 99) * 1e3:>8.2f}")
+    if everything:
+        print(f"{'all':<12} {len(everything):>6} {percentile(everything, 50) * 1e3:>8.2f} {percentile(everything, 99) * 1e3:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,521 @@
+from collections import OrderedDict
+from heapq import nlargest
+from typing import IO, Callable, Iterable, Iterator
+import io
+import math
+import re
+import threading
+import weakref
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from catalog import Catalog, normalize_key
+from search_index import FuzzyCodeIndex, IncrementalSearch, NgramIndex, normalize_text
+
+
+# จำนวนคำแนะนำระหว่างพิมพ์ / รหัสใกล้เคียง
+SUGGEST_LIMIT = 8
+
+# index รหัสแบบพิมพ์ผิดได้ต่อเวอร์ชัน catalog (สร้างเมื่อมีคนใช้ครั้งแรก)
+_FUZZY: "weakref.WeakKeyDictionary[Catalog, FuzzyCodeIndex]" = weakref.WeakKeyDictionary()
+
+# คอลัมน์ที่ส่งออกทาง API / ไฟล์ดาวน์โหลด (มีคอลัมน์ไหนใน catalog ก็ส่งคอลัมน์นั้น)
+RECORD_FIELDS = [
+    "Category",
+    "Model",
+    "Product Name",
+    "Spare Part Code",
+    "Description (TH)",
+    "Description (EN)",
+    "Description (CN)",
+    "Warranty Type",
+    "Unit Price (CNY)",
+    "Price Note",
+    "Spare Parts Qty",
+    "Remark",
+    "CN Product Name",
+    "CN Spare Part Name",
+    "CN Recommended Qty",
+]
+
+
+# =============================
+# LOOKUPS (ใช้ร่วมกันทั้งหน้า Streamlit และ HTTP API)
+# =============================
+
+def code_positions(
+    catalog: Catalog,
+    code: str,
+    exact: bool = True,
+    session: IncrementalSearch | None = None,
+) -> list[int]:
+    """ตำแหน่งแถวที่ Spare Part Code ตรงตัว หรือมีคำนี้อยู่ในรหัส
+
+    session = state ของการพิมพ์ไปค้นไป (แบบ partial กรองต่อจากผลของคำก่อนหน้า)
+    """
+    code = code.strip()
+    if not code:
+        return []
+    if exact:
+        return catalog.code_index.exact(code)
+    if session is not None:
+        return session.search(catalog.code_index, code)
+    return catalog.code_index.partial(code)
+
+
+def search_code(
+    catalog: Catalog,
+    code: str,
+    exact: bool = True,
+    session: IncrementalSearch | None = None,
+) -> pd.DataFrame:
+    """ค้นจาก Spare Part Code แบบตรงตัว หรือแบบมีคำนี้อยู่ในรหัส"""
+    return catalog.df.iloc[code_positions(catalog, code, exact, session)]
+
+
+def search_product(
+    catalog: Catalog,
+    query: str,
+    session: IncrementalSearch | None = None,
+) -> pd.DataFrame:
+    """ค้นจากคำใน Model / Product Name / CN Product Name"""
+    if session is not None:
+        return catalog.df.iloc[session.search(catalog.text_index, query)]
+    return catalog.df.iloc[catalog.text_index.search(query)]
+
+
+def search_description(
+    catalog: Catalog,
+    query: str,
+    session: IncrementalSearch | None = None,
+) -> pd.DataFrame:
+    """ค้นจากคำอธิบายอะไหล่ TH / EN / CN และ CN Spare Part Name (ภาษาไหนก็ได้)"""
+    if session is not None:
+        return catalog.df.iloc[session.search(catalog.description_index, query)]
+    return catalog.df.iloc[catalog.description_index.search(query)]
+
+
+def suggest_codes(catalog: Catalog, prefix: str, limit: int = SUGGEST_LIMIT) -> list[str]:
+    """Spare Part Code ที่ขึ้นต้นด้วยสิ่งที่พิมพ์ (สำหรับคำแนะนำระหว่างพิมพ์)"""
+    return catalog.code_prefixes.complete(prefix, limit)
+
+
+def fuzzy_index(catalog: Catalog) -> FuzzyCodeIndex:
+    """index รหัสแบบพิมพ์ผิดได้ สร้างครั้งแรกที่มีคนใช้ แล้วจำไว้ต่อเวอร์ชัน catalog"""
+    index = _FUZZY.get(catalog)
+    if index is None:
+        index = _FUZZY.setdefault(catalog, FuzzyCodeIndex(catalog.df["Spare Part Code"].tolist()))
+    return index
+
+
+def fuzzy_codes(catalog: Catalog, code: str, limit: int = SUGGEST_LIMIT) -> list[dict]:
+    """รหัสในข้อมูลที่ใกล้เคียงกับที่พิมพ์ (ขีดหาย / ตัวสลับ / O กับ 0) เรียงจากใกล้สุด"""
+    return [
+        {"code": c, "distance": dist}
+        for dist, codes, _ in fuzzy_index(catalog).matches(code, limit)
+        for c in codes
+    ][:limit]
+
+
+def fuzzy_positions(catalog: Catalog, code: str, limit: int = SUGGEST_LIMIT) -> list[int]:
+    """ตำแหน่งแถวของรหัสที่ใกล้เคียง เรียงจากรหัสที่ใกล้สุด"""
+    return [pos for _, _, rows in fuzzy_index(catalog).matches(code, limit) for pos in rows]
+
+
+def suggest_products(catalog: Catalog, prefix: str, limit: int = SUGGEST_LIMIT) -> list[str]:
+    """Model / Product Name ที่มีคำขึ้นต้นด้วยสิ่งที่พิมพ์"""
+    return catalog.product_prefixes.complete(prefix, limit)
+
+
+def build_model_options(
+    catalog: Catalog,
+    keyword: str = "",
+    category: str | None = None,
+) -> list[tuple[str, str]]:
+    """สร้าง list dropdown: (label, model) filter ด้วย category + keyword"""
+    return list(catalog.model_catalog.options(category or "", normalize_text(keyword)))
+
+
+def model_parts(catalog: Catalog, model: str) -> pd.DataFrame:
+    """อะไหล่ทั้งหมดของ Model ที่เลือก"""
+    return catalog.df.iloc[catalog.model_rows(model)]
+
+
+def batch_lookup(catalog: Catalog, codes: list[str]) -> list[dict]:
+    """ค้นหลายรหัสพร้อมกัน (join ครั้งเดียว) คืน list ตามลำดับรหัสที่ส่งมา"""
+    joined = batch_join(catalog, codes)
+    out = [{"code": code, "found": False, "parts": []} for code in codes]
+    for i, pos in zip(joined["order"].tolist(), joined["row"].tolist()):
+        if pos >= 0:
+            out[i]["found"] = True
+            out[i]["parts"].extend(records_at(catalog, [pos]))
+    return out
+
+
+# =============================
+# RANKING (เรียงผลตามความเกี่ยวข้อง)
+# =============================
+# คะแนนต่อแถวมาจาก index (search_index.match_kind x FIELD_WEIGHTS)
+# หน้าการ์ด / API ต้องการแค่ k แถวแรก เลือกด้วย heap (O(n log k)) ไม่ต้องเรียงผลทั้งชุด
+# เรียงทั้งชุด (ranked) เฉพาะเมื่อผู้ใช้ขอให้ตาราง Summary List เรียงตามความเกี่ยวข้อง
+# คะแนนเท่ากันเรียงตาม Model / Spare Part Code (ลำดับเดิมของแผงผลลัพธ์)
+
+_DISPLAY_RANK: "weakref.WeakKeyDictionary[Catalog, list[int]]" = weakref.WeakKeyDictionary()
+
+
+def display_rank(catalog: Catalog) -> list[int]:
+    """ลำดับที่ของแต่ละแถวเมื่อเรียงตาม Model / Spare Part Code (คำนวณครั้งเดียวต่อเวอร์ชัน)"""
+    rank = _DISPLAY_RANK.get(catalog)
+    if rank is None:
+        df = catalog.df
+        sort_cols = [c for c in ["Model", "Spare Part Code"] if c in df.columns]
+        order = np.arange(len(df))
+        if sort_cols:
+            order = df.reset_index(drop=True).sort_values(sort_cols, kind="stable").index.to_numpy()
+        ranks = np.empty(len(df), dtype=np.int64)
+        ranks[order] = np.arange(len(df))
+        rank = _DISPLAY_RANK.setdefault(catalog, ranks.tolist())
+    return rank
+
+
+class RankedResult:
+    """ผลค้นหนึ่งชุด: ตำแหน่งแถว -> คะแนน (ไม่เรียง)
+
+    ไม่ถือ catalog ไว้ (ถูกเก็บใน cache ที่ใช้ catalog เป็น weak key)
+    """
+
+    def __init__(self, scores: dict[int, float], rank: list[int]):
+        self._scores = scores
+        self._rank = rank
+        self._order: list[int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def positions(self) -> list[int]:
+        """ตำแหน่งแถวทั้งหมดตามลำดับที่ค้นพบ (ไม่เรียง)"""
+        return list(self._scores)
+
+    def _key(self, pos: int) -> tuple:
+        return self._scores[pos], -self._rank[pos]
+
+    def top(self, k: int) -> list[int]:
+        """ตำแหน่งแถวของ k อันดับแรก (คะแนนสูงก่อน คะแนนเท่ากันเรียงตาม Model / Code)"""
+        if self._order is not None:
+            return self._order[:k]
+        return nlargest(k, self._scores, key=self._key)
+
+    def ranked(self) -> list[int]:
+        """ตำแหน่งแถวทั้งหมดเรียงแบบเดียวกับ top (เรียงครั้งแรกครั้งเดียว)"""
+        if self._order is None:
+            self._order = sorted(self._scores, key=self._key, reverse=True)
+        return self._order
+
+
+def _ranked(catalog: Catalog, scores: dict[int, float]) -> RankedResult:
+    return RankedResult(scores, display_rank(catalog))
+
+
+def ranked_code(
+    catalog: Catalog,
+    code: str,
+    exact: bool = True,
+    session: IncrementalSearch | None = None,
+) -> RankedResult:
+    """เหมือน code_positions แต่ให้คะแนน: ตรงทั้งรหัส > ขึ้นต้น > ขึ้นต้นช่วงหลังขีด > อยู่กลางรหัส"""
+    code = code.strip()
+    if exact or not code:
+        return _ranked(catalog, dict.fromkeys(code_positions(catalog, code, exact=True), 1))
+
+    index = catalog.code_index
+    if session is not None:
+        terms, keys = session.match(index, code)
+    else:
+        terms = index.query_terms(code)
+        keys = index.match(terms)
+    return _ranked(catalog, index.scored_rows(keys, terms))
+
+
+def ranked_product(
+    catalog: Catalog,
+    query: str,
+    session: IncrementalSearch | None = None,
+) -> RankedResult:
+    """เหมือน search_product แต่ให้คะแนนตามชนิดการตรงของแต่ละคำ x น้ำหนักคอลัมน์"""
+    return _ranked_text(catalog, catalog.text_index, query, session)
+
+
+def ranked_description(
+    catalog: Catalog,
+    query: str,
+    session: IncrementalSearch | None = None,
+) -> RankedResult:
+    """เหมือน search_description แต่ให้คะแนนตามชนิดการตรงของแต่ละคำ"""
+    return _ranked_text(catalog, catalog.description_index, query, session)
+
+
+def _ranked_text(
+    catalog: Catalog,
+    index: NgramIndex,
+    query: str,
+    session: IncrementalSearch | None,
+) -> RankedResult:
+    if session is not None:
+        terms, keys = session.match(index, query)
+    else:
+        terms = index.query_terms(query)
+        keys = index.match(terms)
+    return _ranked(catalog, index.scored_rows(keys, terms))
+
+
+def ranked_model(catalog: Catalog, model: str) -> RankedResult:
+    """อะไหล่ทุกชิ้นของ Model (คะแนนเท่ากัน เรียงตาม Spare Part Code)"""
+    return _ranked(catalog, dict.fromkeys(catalog.model_rows(model), 1))
+
+
+def ranked_fuzzy(catalog: Catalog, code: str, limit: int = SUGGEST_LIMIT) -> RankedResult:
+    """รหัสที่ใกล้เคียง: ระยะแก้ไขน้อยกว่าได้คะแนนสูงกว่า"""
+    best: dict[int, float] = {}
+    for dist, _, rows in fuzzy_index(catalog).matches(code, limit):
+        for pos in rows:
+            best.setdefault(pos, -dist)
+    return _ranked(catalog, best)
+
+
+# =============================
+# RESULT CACHE (ผลค้นต่อคำค้น ใช้ร่วมกันทุก session)
+# =============================
+
+# จำนวนคำค้นที่จำผลไว้ต่อเวอร์ชัน catalog (LRU)
+RESULT_CACHE_SIZE = 256
+
+_RESULTS: "weakref.WeakKeyDictionary[Catalog, OrderedDict]" = weakref.WeakKeyDictionary()
+_RESULTS_LOCK = threading.Lock()
+
+
+def cached_result(catalog: Catalog, key: tuple, compute: Callable[[], RankedResult]) -> RankedResult:
+    """ผลค้นของ key จำไว้ต่อเวอร์ชัน catalog (โหลดข้อมูลใหม่ cache ของเวอร์ชันเก่าหายไปเอง)
+
+    compute() ถูกเรียกเฉพาะ key ที่ยังไม่เคยค้น ผลที่คืนใช้ร่วมกันทุก session ห้ามแก้
+    """
+    with _RESULTS_LOCK:
+        results = _RESULTS.get(catalog)
+        if results is None:
+            results = _RESULTS.setdefault(catalog, OrderedDict())
+        if key in results:
+            results.move_to_end(key)
+            return results[key]
+
+    value = compute()
+    with _RESULTS_LOCK:
+        results[key] = value
+        while len(results) > RESULT_CACHE_SIZE:
+            results.popitem(last=False)
+    return value
+
+
+# =============================
+# BATCH LOOKUP (หลายรหัสจากไฟล์ / ข้อความที่วางมา)
+# =============================
+
+# คอลัมน์ของตารางผล batch (ต่อท้ายคอลัมน์ Input Code / Status)
+BATCH_FIELDS = [
+    "Spare Part Code",
+    "Model",
+    "Product Name",
+    "Description (TH)",
+    "Description (EN)",
+    "CN Recommended Qty",
+    "Unit Price (CNY)",
+    "Price Note",
+]
+BATCH_FOUND = "found"
+BATCH_NOT_FOUND = "not found"
+# ไฟล์ใหญ่ประมวลผลทีละก้อน เพื่อให้หน้าเว็บแสดงความคืบหน้าและไม่ต้อง join ทีเดียวทั้งไฟล์
+BATCH_CHUNK = 5000
+
+_SPLIT_RE = re.compile(r"[\r\n,;\t]+")
+
+# key ของ Spare Part Code ต่อเวอร์ชัน catalog (normalize ครั้งเดียว ใช้ join ทุก batch)
+_CODE_KEYS: "weakref.WeakKeyDictionary[Catalog, pd.DataFrame]" = weakref.WeakKeyDictionary()
+
+
+def parse_codes(text: str) -> list[str]:
+    """แยกรหัสจากข้อความที่วางมา (ขึ้นบรรทัดใหม่ / , / ; / tab) ตัดช่องว่างและบรรทัดว่าง"""
+    return [c.strip() for c in _SPLIT_RE.split(text or "") if c.strip()]
+
+
+# ไฟล์ที่อ่านไม่ได้ (CSV คอลัมน์ไม่เท่ากัน / ไฟล์ว่าง / ไม่ใช่ UTF-8 / XLSX เสีย) แอปแสดงเป็นข้อความ error
+# (XLSX เสียถูกแปลงเป็น ParserError ใน _read_xlsx)
+CODE_FILE_ERRORS = (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError)
+
+
+def _is_code_header(value) -> bool:
+    return isinstance(value, str) and ("code" in normalize_text(value) or "รหัส" in value)
+
+
+def _code_column(columns) -> int:
+    """เลือกคอลัมน์ที่ชื่อมีคำว่า code (เช่น Spare Part Code) ไม่มีก็ใช้คอลัมน์แรก"""
+    for i, col in enumerate(columns):
+        if _is_code_header(col):
+            return i
+    return 0
+
+
+def _read_xlsx(file: IO[bytes]) -> pd.DataFrame:
+    """ชีตแรกของ XLSX ไฟล์เสีย / ไม่ใช่ XLSX (เช่น CSV ที่เปลี่ยนนามสกุล) raise ParserError"""
+    try:
+        return pd.read_excel(file, header=None, dtype=str, engine="openpyxl")
+    except (ValueError, KeyError, zipfile.BadZipFile) as e:
+        raise pd.errors.ParserError(f"ไม่ใช่ไฟล์ XLSX ที่อ่านได้ ({e})") from e
+
+
+def _iter_text_codes(file: IO[bytes], chunk_size: int) -> Iterator[list[str]]:
+    """TXT: อ่านทีละบรรทัด แยกรหัสด้วยตัวคั่นเดียวกับ parse_codes (, / ; / tab)"""
+    text = io.TextIOWrapper(file, encoding="utf-8-sig")
+    try:
+        codes: list[str] = []
+        first = True
+        for line in text:
+            line_codes = parse_codes(line)
+            if first and line_codes:
+                first = False
+                if any(_is_code_header(c) for c in line_codes):
+                    continue
+            codes.extend(line_codes)
+            while len(codes) >= chunk_size:
+                yield codes[:chunk_size]
+                codes = codes[chunk_size:]
+        if codes:
+            yield codes
+    finally:
+        text.detach()  # ไม่ปิดไฟล์ที่อัปโหลด (แผงผลลัพธ์ seek(0) แล้วอ่านซ้ำ)
+
+
+def iter_code_file(file: IO[bytes], name: str, chunk_size: int = BATCH_CHUNK) -> Iterator[list[str]]:
+    """อ่านรหัสจากไฟล์ที่อัปโหลดทีละก้อน (CSV / TXT อ่านแบบ stream, XLSX อ่านชีตแรกทั้งชีต)
+
+    ถ้าแถวแรกไม่มีหัวคอลัมน์ที่มีคำว่า code ถือว่าแถวแรกเป็นรหัสด้วย
+    ไฟล์เสีย raise หนึ่งใน CODE_FILE_ERRORS ระหว่างวนอ่าน
+    """
+    if name.lower().endswith(".txt"):
+        yield from _iter_text_codes(file, chunk_size)
+        return
+    if name.lower().endswith(".xlsx"):
+        chunks = [_read_xlsx(file)]
+    else:
+        chunks = pd.read_csv(file, header=None, dtype=str, chunksize=chunk_size)
+
+    col = None
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        if col is None:
+            header = chunk.iloc[0].tolist()
+            col = _code_column(header)
+            if any(_is_code_header(h) for h in header):
+                chunk = chunk.iloc[1:]
+        values = chunk.iloc[:, col].dropna().astype(str).str.strip()
+        values = values[values != ""].tolist()
+        for start in range(0, len(values), chunk_size):
+            yield values[start:start + chunk_size]
+
+
+def _code_keys(catalog: Catalog) -> pd.DataFrame:
+    keys = _CODE_KEYS.get(catalog)
+    if keys is None:
+        key = normalize_key(catalog.df["Spare Part Code"])
+        keys = pd.DataFrame({"key": key, "row": np.arange(len(key))})
+        keys = _CODE_KEYS.setdefault(catalog, keys[keys["key"] != ""])
+    return keys
+
+
+def batch_join(catalog: Catalog, codes: Iterable[str]) -> pd.DataFrame:
+    """join รหัสทั้งชุดกับ catalog ครั้งเดียว ด้วย key ที่ normalize แล้ว (แบบเดียวกับ join_cn)
+
+    คืน DataFrame คอลัมน์ order (ลำดับรหัสที่ส่งมา), code, row (ตำแหน่งแถวใน
+    catalog หรือ -1 ถ้าไม่พบ) เรียงตาม order รหัสเดียวกันที่อยู่หลาย Model ได้หลายแถว
+    """
+    codes = pd.Series(list(codes), dtype=object)
+    left = pd.DataFrame({
+        "order": np.arange(len(codes)),
+        "code": codes,
+        "key": normalize_key(codes) if len(codes) else codes,
+    })
+    merged = left.merge(_code_keys(catalog), on="key", how="left", sort=False)
+    merged["row"] = merged["row"].fillna(-1).astype(np.int64)
+    return merged[["order", "code", "row"]]
+
+
+def batch_table(catalog: Catalog, codes: Iterable[str], order_offset: int = 0) -> pd.DataFrame:
+    """ตารางผล batch: Input Code, Status (found / not found) + BATCH_FIELDS ของแถวที่พบ"""
+    joined = batch_join(catalog, codes)
+    found = joined["row"].to_numpy() >= 0
+
+    cols = [c for c in BATCH_FIELDS if c in catalog.df.columns]
+    picked = catalog.df.iloc[joined["row"].to_numpy()[found]][cols].reset_index(drop=True)
+
+    out = pd.DataFrame({
+        "No.": joined["order"].to_numpy() + 1 + order_offset,
+        "Input Code": joined["code"].to_numpy(),
+        "Status": np.where(found, BATCH_FOUND, BATCH_NOT_FOUND),
+    })
+    for col in cols:
+        values = pd.Series(pd.NA, index=out.index, dtype=object)
+        values[found] = picked[col].astype(object).to_numpy()
+        out[col] = values
+    return out
+
+
+def iter_batch_table(catalog: Catalog, code_chunks: Iterable[list[str]]) -> Iterator[pd.DataFrame]:
+    """batch_table ทีละก้อน (ลำดับ No. ต่อเนื่องข้ามก้อน) ใช้กับไฟล์ใหญ่"""
+    offset = 0
+    for codes in code_chunks:
+        yield batch_table(catalog, codes, order_offset=offset)
+        offset += len(codes)
+
+
+def batch_csv(tables: Iterable[pd.DataFrame]) -> bytes:
+    """รวมผลแต่ละก้อนเป็น CSV (UTF-8 มี BOM ให้ Excel เปิดภาษาไทย/จีนได้ถูก)"""
+    buf = io.StringIO()
+    for i, table in enumerate(tables):
+        table.to_csv(buf, index=False, header=(i == 0))
+    return buf.getvalue().encode("utf-8-sig")
+
+
+# =============================
+# SERIALIZE
+# =============================
+
+def _json_value(value):
+    if value is None:
+        return None
+    if isinstance(value, float):
+        return None if math.isnan(value) else value
+    if hasattr(value, "item"):  # numpy scalar
+        return _json_value(value.item())
+    return value
+
+
+def records(df: pd.DataFrame, fields: list[str] = RECORD_FIELDS) -> list[dict]:
+    """แปลงแถวเป็น list ของ dict ที่ส่งเป็น JSON ได้ (NaN -> None)"""
+    cols = [c for c in fields if c in df.columns]
+    return [
+        {col: _json_value(v) for col, v in zip(cols, row)}
+        for row in df[cols].itertuples(index=False, name=None)
+    ]
+
+
+# แถวของ catalog แต่ละเวอร์ชันแปลงเป็น dict ครั้งเดียว (catalog มีไม่กี่ร้อยแถว)
+# แล้ว API หยิบตามตำแหน่งแถว แทนที่จะ iloc + itertuples ใหม่ทุก request
+_RECORDS: "weakref.WeakKeyDictionary[Catalog, list[dict]]" = weakref.WeakKeyDictionary()
+
+
+def records_at(catalog: Catalog, positions: list[int]) -> list[dict]:
+    """record ของแถวตามตำแหน่ง (dict ที่คืนใช้ร่วมกัน ห้ามแก้)"""
+    rows = _RECORDS.get(catalog)
+    if rows is None:
+        rows = _RECORDS.setdefault(catalog, records(catalog.df))
+    return [rows[pos] for pos in positions]
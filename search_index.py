@@ -0,0 +1,630 @@
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Iterable
+import functools
+import re
+import unicodedata
+import weakref
+
+
+# =============================
+# TEXT NORMALIZATION
+# =============================
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(value) -> str:
+    """NFKC (แปลงตัวอักษร full-width เช่น （ ） เป็นตัวปกติ) + casefold + ยุบช่องว่าง"""
+    if value is None:
+        return ""
+    text = unicodedata.normalize("NFKC", str(value)).casefold()
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def _script(ch: str) -> str:
+    if "\u0e00" <= ch <= "\u0e7f":
+        return "thai"
+    if (
+        "\u3040" <= ch <= "\u30ff"  # ญี่ปุ่น (คานะ) ปนมาในชื่อบางตัว
+        or "\u3400" <= ch <= "\u9fff"
+        or "\uf900" <= ch <= "\ufaff"
+    ):
+        return "cjk"
+    return "other"
+
+
+def tokenize(text: str) -> list[str]:
+    """แยกคำด้วยช่องว่าง และตัดตรงรอยต่อระหว่างภาษา (ไทย / จีน / อื่นๆ)
+    เช่น "ฝักบัวhand shower" -> ["ฝักบัว", "hand", "shower"]"""
+    tokens: list[str] = []
+    for word in normalize_text(text).split(" "):
+        if not word:
+            continue
+        start = 0
+        for i in range(1, len(word)):
+            if _script(word[i]) != _script(word[i - 1]):
+                tokens.append(word[start:i])
+                start = i
+        tokens.append(word[start:])
+    return tokens
+
+
+# =============================
+# RELEVANCE
+# =============================
+# คะแนนของ term หนึ่งตัวเทียบกับค่าหนึ่งค่า: ตรงทั้งค่า > ขึ้นต้น > ขึ้นต้นคำ > อยู่กลางคำ
+
+MATCH_EXACT = 4
+MATCH_PREFIX = 3
+MATCH_TOKEN = 2
+MATCH_SUBSTRING = 1
+
+_WORD_SEPARATORS = frozenset(" -_/.,()#+")
+
+
+def match_kind(key: str, term: str) -> int:
+    """ชนิดการตรงของ term ใน key (ทั้งคู่ normalize แล้ว และ term อยู่ใน key แน่นอน)"""
+    if key == term:
+        return MATCH_EXACT
+    if key.startswith(term):
+        return MATCH_PREFIX
+    i = key.find(term)
+    while i > 0:
+        prev = key[i - 1]
+        if prev in _WORD_SEPARATORS or _script(prev) != _script(key[i]):
+            return MATCH_TOKEN
+        i = key.find(term, i + 1)
+    return MATCH_SUBSTRING
+
+
+# =============================
+# N-GRAM INDEX (BASE)
+# =============================
+
+class NgramIndex:
+    """n-gram postings (ยาว 1..NGRAM ตัวอักษร) บน key ที่ไม่ซ้ำกัน
+
+    key แต่ละตัวจำตำแหน่งแถวของตัวเองไว้ การหา substring ทำโดย intersect
+    postings ของ n-gram ในคำค้น แล้วค่อยเช็ค substring จริงเฉพาะตัวที่เหลือ
+    """
+
+    NGRAM = 3
+
+    def __init__(self, rows_by_key: dict[str, list[int]]):
+        self._keys = list(rows_by_key)
+        self._rows = [rows_by_key[k] for k in self._keys]
+
+        grams: dict[str, set[int]] = defaultdict(set)
+        for key_id, key in enumerate(self._keys):
+            for n in range(1, self.NGRAM + 1):
+                for i in range(len(key) - n + 1):
+                    grams[key[i:i + n]].add(key_id)
+        self._grams = dict(grams)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _candidates(self, q: str, within: set[int] | None = None) -> set[int]:
+        n = min(len(q), self.NGRAM)
+        postings = []
+        for i in range(len(q) - n + 1):
+            ids = self._grams.get(q[i:i + n])
+            if not ids:
+                return set()
+            postings.append(ids)
+
+        postings.sort(key=len)
+        if within is not None and len(within) <= len(postings[0]):
+            # ชุดเดิมเล็กกว่าทุก postings: เช็ค substring จากชุดเดิมเลยถูกกว่า intersect
+            return set(within)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
+
+    def _matching_keys(self, q: str, within: set[int] | None = None) -> set[int]:
+        """key id ที่มี q เป็น substring (within = จำกัดให้อยู่ในชุด key นี้)"""
+        if not q:
+            return set()
+        return {k for k in self._candidates(q, within) if q in self._keys[k]}
+
+    def query_terms(self, query: str) -> list[str]:
+        """แปลงคำค้นเป็น term ที่ต้องเป็น substring ของ key (subclass กำหนดวิธี normalize)"""
+        return [query] if query else []
+
+    def match(self, terms: list[str], within: set[int] | None = None) -> set[int]:
+        """key id ที่มีทุก term เป็น substring
+
+        within = ชุด key ที่รู้อยู่แล้วว่าครอบผลลัพธ์ไว้ (เช่นผลของคำค้นก่อนหน้า)
+        ถ้าชุดนี้เล็กกว่า postings ทุกตัวของคำค้นจะเช็ค substring จากชุดนี้เลย
+        (พิมพ์ต่อจนผลเหลือน้อย) ผลยังกว้างอยู่ก็ใช้ n-gram ตามปกติ
+        """
+        terms = sorted((t for t in terms if t), key=len, reverse=True)
+        if not terms:
+            return set()
+
+        key_ids = self._matching_keys(terms[0], within)
+        for term in terms[1:]:
+            if not key_ids:
+                break
+            key_ids = {k for k in key_ids if term in self._keys[k]}
+        return key_ids
+
+    def _rows_of(self, key_ids: Iterable[int]) -> list[int]:
+        rows: set[int] = set()
+        for key_id in key_ids:
+            rows.update(self._rows[key_id])
+        return sorted(rows)
+
+    def _key_score(self, key_id: int, terms: list[str]) -> float:
+        return sum(match_kind(self._keys[key_id], term) for term in terms)
+
+    def scored_rows(self, key_ids: Iterable[int], terms: list[str]) -> dict[int, float]:
+        """ตำแหน่งแถว -> คะแนน (ไม่เรียง ให้ผู้เรียกเลือก top-k เอง)
+
+        คะแนนของแถว = คะแนนสูงสุดของ key ที่แถวนั้นตรง ให้คะแนนต่อ key ครั้งเดียว
+        (key ไม่ซ้ำมีน้อยกว่าจำนวนแถวมาก)
+        """
+        best: dict[int, float] = {}
+        for key_id in key_ids:
+            score = self._key_score(key_id, terms)
+            for pos in self._rows[key_id]:
+                if score > best.get(pos, 0):
+                    best[pos] = score
+        return best
+
+
+# =============================
+# SPARE PART CODE INDEX
+# =============================
+
+class CodeIndex(NgramIndex):
+    """index ของ Spare Part Code สร้างครั้งเดียวต่อเวอร์ชันข้อมูล
+
+    - exact: dict รหัสตัวเล็ก -> ตำแหน่งแถว
+    - partial: n-gram postings ของรหัส
+    """
+
+    def __init__(self, codes: Iterable[str]):
+        rows_by_key: dict[str, list[int]] = defaultdict(list)
+        for pos, code in enumerate(codes):
+            rows_by_key[str(code).strip().lower()].append(pos)
+
+        super().__init__(rows_by_key)
+        self._exact = {k: i for i, k in enumerate(self._keys)}
+
+    def exact(self, query: str) -> list[int]:
+        """ตำแหน่งแถวที่รหัสตรงกับ query (ไม่สนตัวเล็ก/ใหญ่)"""
+        key_id = self._exact.get(query.strip().lower())
+        return list(self._rows[key_id]) if key_id is not None else []
+
+    def query_terms(self, query: str) -> list[str]:
+        query = query.strip().lower()
+        return [query] if query else []
+
+    def partial(self, query: str) -> list[int]:
+        """ตำแหน่งแถวที่รหัสมี query เป็นส่วนหนึ่ง เรียงตามลำดับแถวเดิม"""
+        return self._rows_of(self.match(self.query_terms(query)))
+
+
+# =============================
+# FUZZY CODE INDEX (พิมพ์ผิดได้)
+# =============================
+
+_NOT_ALNUM_RE = re.compile(r"[^0-9A-Z]")
+# ตัวอักษรที่พิมพ์สลับกับตัวเลขบ่อย ถือเป็นตัวเดียวกัน
+_CONFUSABLE = str.maketrans({"O": "0", "I": "1"})
+
+
+def fuzzy_key(code) -> str:
+    """key ของรหัสสำหรับ fuzzy: NFKC + ตัวพิมพ์ใหญ่ + ตัด - / ช่องว่าง / จุด + O->0, I->1
+
+    เช่น "kd236 1179" และ "KD236-1I79" ได้ key เดียวกันคือ KD2361179
+    """
+    if code is None or code != code:
+        return ""
+    text = unicodedata.normalize("NFKC", str(code)).upper()
+    return _NOT_ALNUM_RE.sub("", text).translate(_CONFUSABLE)
+
+
+def _bigrams(key: str) -> set[str]:
+    padded = f"^{key}$"  # ขอบหน้า/หลังนับเป็น bigram ด้วย คำสั้นจะได้กรองได้
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int | None:
+    """ระยะแก้ไข (แทน / แทรก / ลบ / สลับตัวติดกัน = 1) ถ้าเกิน limit คืน None
+
+    optimal string alignment คำนวณเฉพาะแถบ |i - j| <= limit (ช่องนอกแถบเกิน limit
+    แน่นอน) และหยุดทันทีเมื่อทั้งแถวเกิน limit
+    """
+    la, lb = len(a), len(b)
+    if abs(la - lb) > limit:
+        return None
+    over = limit + 1
+    prev2: list[int] = []
+    prev = [j if j <= limit else over for j in range(lb + 1)]
+    for i in range(1, la + 1):
+        cur = [over] * (lb + 1)
+        if i <= limit:
+            cur[0] = i
+        lo, hi = max(1, i - limit), min(lb, i + limit)
+        for j in range(lo, hi + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            d = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d = min(d, prev2[j - 2] + 1)
+            cur[j] = min(d, over)
+        if min(cur[lo - 1:hi + 1]) > limit:
+            return None
+        prev2, prev = prev, cur
+    return prev[lb] if prev[lb] <= limit else None
+
+
+class FuzzyCodeIndex:
+    """ค้นรหัสที่พิมพ์ผิดเล็กน้อย (ขีดหาย / ตัวเลขสลับ / O กับ 0) โดยไม่ต้องเทียบทุกรหัส
+
+    1. รหัสทุกตัวแปลงเป็น fuzzy_key แล้วเก็บ postings ของ bigram (มีขอบ ^ $)
+    2. คัด candidate ด้วย q-gram lemma: แก้ 1 ครั้งทำให้ bigram ของคำค้นหายได้
+       ไม่เกิน 3 ตัว (สลับตัวติดกัน) รหัสที่ห่างไม่เกิน k จึงต้องมี bigram ร่วม
+       อย่างน้อย (จำนวน bigram ของคำค้น - 3k) นับด้วย Counter ใน C
+    3. คำนวณ edit_distance จริงเฉพาะ candidate ที่มี bigram ร่วมมากสุดไม่เกิน
+       MAX_CANDIDATES ตัว งานต่อคำค้นจึงมีเพดาน ไม่โตตามจำนวนรหัส
+    ลองยอมผิด 1 ตัวก่อน (กรองได้แคบมาก) ไม่เจอค่อยขยายเป็น 2 ตัวสำหรับรหัสยาว
+    """
+
+    MIN_LENGTH = 4
+    MAX_CANDIDATES = 200
+
+    def __init__(self, codes: Iterable[str]):
+        rows_by_key: dict[str, list[int]] = defaultdict(list)
+        codes_by_key: dict[str, list[str]] = defaultdict(list)
+        for pos, code in enumerate(codes):
+            key = fuzzy_key(code)
+            if not key:
+                continue
+            rows_by_key[key].append(pos)
+            code = str(code).strip()
+            if code not in codes_by_key[key]:
+                codes_by_key[key].append(code)
+
+        self._keys = list(rows_by_key)
+        self._rows = [rows_by_key[k] for k in self._keys]
+        self._codes = [codes_by_key[k] for k in self._keys]
+
+        grams: dict[str, list[int]] = defaultdict(list)
+        for key_id, key in enumerate(self._keys):
+            for gram in _bigrams(key):
+                grams[gram].append(key_id)
+        self._grams = dict(grams)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    @staticmethod
+    def max_distance(query_key: str) -> int:
+        """จำนวนตัวที่ยอมให้ผิด: รหัสสั้นยอม 1 ตัว รหัสยาวยอม 2 ตัว"""
+        return 1 if len(query_key) <= 6 else 2
+
+    def matches(self, query: str, limit: int = 8) -> list[tuple[int, list[str], list[int]]]:
+        """(ระยะ, รหัสในข้อมูล, ตำแหน่งแถว) เรียงจากใกล้สุด ไม่เกิน limit key"""
+        q = fuzzy_key(query)
+        if len(q) < self.MIN_LENGTH:
+            return []
+
+        grams = _bigrams(q)
+        counts = Counter()
+        for gram in grams:
+            ids = self._grams.get(gram)
+            if ids:
+                counts.update(ids)
+        max_k = self.max_distance(q)
+        loosest = max(1, len(grams) - 3 * max_k)
+        ranked = sorted(
+            ((shared, key_id) for key_id, shared in counts.items() if shared >= loosest),
+            reverse=True,
+        )[:self.MAX_CANDIDATES]
+
+        found = []
+        for k in range(1, max_k + 1):
+            need = max(1, len(grams) - 3 * k)
+            for shared, key_id in ranked:
+                if shared < need:
+                    break
+                key = self._keys[key_id]
+                dist = edit_distance(q, key, k)
+                if dist is not None:
+                    found.append((dist, abs(len(key) - len(q)), key, key_id))
+            if found:
+                break
+
+        found.sort()
+        return [(dist, self._codes[key_id], list(self._rows[key_id])) for dist, _, _, key_id in found[:limit]]
+
+
+# =============================
+# PRODUCT / MODEL TEXT INDEX
+# =============================
+
+PRODUCT_FIELDS = ("Model", "Product Name", "CN Product Name")
+# น้ำหนักคะแนนต่อคอลัมน์ (ตรงกับชื่อรุ่นสำคัญกว่าตรงกับชื่อสินค้า)
+FIELD_WEIGHTS = {"Model": 3, "Product Name": 2, "CN Product Name": 2}
+
+
+class TextIndex(NgramIndex):
+    """inverted index ของหลายคอลัมน์ (ค่าเริ่มต้น Model / Product Name / CN Product Name)
+
+    ค่าในคอลัมน์ถูก normalize (NFKC + casefold) แล้วเก็บเป็น key ไม่ซ้ำ
+    (Model / Product Name ซ้ำกันทั้งบล็อก จึงเหลือ key ไม่กี่ร้อยตัว)
+    คำค้นถูกแยกเป็น token ตามช่องว่างและรอยต่อภาษา ทุก token ต้องเป็น
+    substring ของค่าในคอลัมน์เดียวกัน ใช้ n-gram ตัวอักษรจึงค้นภาษาไทย/จีน
+    ได้โดยไม่ต้องตัดคำ
+    """
+
+    # ค่าในคอลัมน์ -> key (subclass เปลี่ยนได้ ต้องใช้กับคำค้นแบบเดียวกัน)
+    _normalize = staticmethod(normalize_text)
+
+    def __init__(self, df, fields: Iterable[str] = PRODUCT_FIELDS):
+        rows_by_key: dict[str, list[int]] = defaultdict(list)
+        weight_of: dict[str, int] = {}
+        for col in fields:
+            if col not in df.columns:
+                continue
+            weight = FIELD_WEIGHTS.get(col, 1)
+            for pos, value in enumerate(df[col].tolist()):
+                if value is None or value != value:  # None / NaN
+                    continue
+                key = self._normalize(value)
+                if key:
+                    rows_by_key[key].append(pos)
+                    weight_of[key] = max(weight, weight_of.get(key, 0))
+
+        super().__init__(rows_by_key)
+        self._weights = [weight_of[k] for k in self._keys]
+
+    def _key_score(self, key_id: int, terms: list[str]) -> float:
+        return super()._key_score(key_id, terms) * self._weights[key_id]
+
+    def query_terms(self, query: str) -> list[str]:
+        return tokenize(query)
+
+    def search(self, query: str) -> list[int]:
+        """ตำแหน่งแถวที่ตรงกับคำค้น เรียงตามลำดับแถวเดิม"""
+        return self._rows_of(self.match(self.query_terms(query)))
+
+
+# =============================
+# DESCRIPTION INDEX (TH / EN / CN)
+# =============================
+# คำอธิบายอะไหล่ 3 ภาษา + ชื่ออะไหล่จากไฟล์ฝั่งจีน normalize ก่อนทำ index:
+# - NFKC / casefold (normalize_text) เช่น （ ） full-width กับ ( ) ถือเป็นตัวเดียวกัน
+# - ไทย: ไม่ตัดคำ ใช้ n-gram ตัวอักษรของ NgramIndex ค้นเป็น substring ได้เลย
+#   แค่ลบช่องว่างระหว่างตัวอักษรไทยทิ้ง ("ไส้กรอง น้ำ" = "ไส้กรองน้ำ")
+# - อังกฤษ: ตัดเฉพาะรูปพหูพจน์ของคำค้น (stem_en) filters -> filter ส่วน key ไม่ตัด
+#   ผลที่ได้เป็นต้นคำของรูปเดิม จึงยังค้นเป็น substring ได้ทั้งรูปเดี่ยวและพหูพจน์
+#   (ไม่ตัด -ing / -ed เพราะคำนามอย่าง spring / string จะกลายเป็น spr / str)
+# - จีน: คำค้นที่ยาวกว่า 2 ตัวแตกเป็น bigram (阀芯体 -> 阀芯, 芯体) ทุกตัวต้องมีในค่าเดียวกัน
+
+DESCRIPTION_FIELDS = ("Description (TH)", "Description (EN)", "Description (CN)", "CN Spare Part Name")
+
+_EN_WORD_RE = re.compile(r"[a-z]+")
+_THAI_GAP_RE = re.compile(r"(?<=[\u0e00-\u0e7f]) (?=[\u0e00-\u0e7f])")
+
+
+def stem_en(word: str) -> str:
+    """ตัดรูปพหูพจน์ภาษาอังกฤษ ผลเป็น prefix ของคำเดิมเสมอ
+    (hoses -> hose, boxes -> box, batteries -> batter ตรงกับทั้ง battery / batteries)"""
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies") and len(word) >= 7:
+        return word[:-3]
+    if word.endswith(("sses", "ches", "shes", "xes", "zes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def normalize_description(value) -> str:
+    """normalize_text + ลบช่องว่างระหว่างคำไทย (ใช้กับทั้ง key และคำค้น)"""
+    return _THAI_GAP_RE.sub("", normalize_text(value))
+
+
+class DescriptionIndex(TextIndex):
+    """TextIndex ของคอลัมน์คำอธิบาย (DESCRIPTION_FIELDS) ค้นข้ามภาษาได้ด้วยคำค้นเดียว
+
+    key และคำค้นผ่าน normalize_description เหมือนกัน คำค้นอังกฤษตัดพหูพจน์
+    (key ไม่ตัด) คำค้นจีนแตกเป็น bigram
+    """
+
+    _normalize = staticmethod(normalize_description)
+
+    def __init__(self, df, fields: Iterable[str] = DESCRIPTION_FIELDS):
+        super().__init__(df, fields)
+
+    def query_terms(self, query: str) -> list[str]:
+        terms: list[str] = []
+        query = _EN_WORD_RE.sub(lambda m: stem_en(m.group()), normalize_description(query))
+        for token in tokenize(query):
+            if _script(token[0]) == "cjk" and len(token) > 2:
+                terms.extend(token[i:i + 2] for i in range(len(token) - 1))
+            else:
+                terms.append(token)
+        return list(dict.fromkeys(terms))
+
+
+# =============================
+# SEARCH-AS-YOU-TYPE
+# =============================
+
+# จำนวน key ขั้นต่ำที่การกรองต่อจากผลเดิมเร็วกว่าค้นจาก index เต็ม
+# (วัดจาก CodeIndex สังเคราะห์: 5,000 key พอๆ กัน, 50,000 key เร็วขึ้น ~40%)
+# catalog ปัจจุบันมีไม่ถึงพัน key จึงค้นเต็มทุกครั้งและไม่เก็บ state
+INCREMENTAL_MIN_KEYS = 10_000
+
+
+class IncrementalSearch:
+    """ค้นแบบพิมพ์ไปค้นไปของผู้ใช้หนึ่งคน (เก็บไว้ใน session) ใช้กับ index ตระกูล NgramIndex
+
+    ถ้าคำค้นใหม่ "ต่อจาก" คำเดิม คือ term เดิมทุกตัวยังเป็น substring ของ term ใหม่
+    สักตัว (พิมพ์ต่อท้าย / เพิ่มคำ) key ที่ตรงกับคำใหม่ต้องอยู่ในผลของคำเดิมแน่นอน
+    จึงส่ง key ชุดเดิมเข้า match(within=...) ถ้าเล็กกว่า postings ก็กรองจากชุดเดิมแทน
+    ถ้าลบตัวอักษร / เปลี่ยนคำ / index เปลี่ยน (โหลด catalog ใหม่) ค่อยค้นจาก index เต็ม
+    index ที่มี key น้อยกว่า INCREMENTAL_MIN_KEYS ค้นเต็มเสมอ (เร็วพอกัน ไม่ต้องจำผลเดิม)
+    """
+
+    def __init__(self):
+        self._index = None  # weakref ไม่ให้ session ถือ catalog เวอร์ชันเก่าไว้
+        self._terms: list[str] = []
+        self._keys: set[int] = set()
+        self.narrowed = 0
+        self.full = 0
+
+    def _extends(self, index: NgramIndex, terms: list[str]) -> bool:
+        if self._index is None or self._index() is not index or not self._terms:
+            return False
+        return all(any(old in term for term in terms) for old in self._terms)
+
+    def search(self, index: NgramIndex, query: str) -> list[int]:
+        """ตำแหน่งแถวที่ตรงกับคำค้น (ผลเหมือน index.search / partial ทุกประการ)"""
+        return index._rows_of(self.match(index, query)[1])
+
+    def match(self, index: NgramIndex, query: str) -> tuple[list[str], set[int]]:
+        """(terms, key id ที่ตรง) ใช้ต่อกับ index.scored_rows เพื่อให้คะแนน"""
+        terms = index.query_terms(query)
+        if len(index._keys) < INCREMENTAL_MIN_KEYS:
+            self._index, self._terms, self._keys = None, [], set()
+            self.full += 1
+            return terms, index.match(terms)
+
+        if self._extends(index, terms):
+            keys = index.match(terms, within=self._keys)
+            self.narrowed += 1
+        else:
+            keys = index.match(terms)
+            self.full += 1
+
+        self._index = weakref.ref(index)
+        self._terms = terms
+        self._keys = keys
+        return terms, keys
+
+
+class PrefixIndex:
+    """คำแนะนำแบบ prefix (autocomplete): key ที่ normalize แล้วเรียงไว้ หาด้วย bisect
+
+    word_starts=True เก็บทุกตำแหน่งต้นคำด้วย พิมพ์ "toi" ก็เจอ "JOMOO ... Toilet"
+    งานต่อคำค้นหนึ่งครั้ง = bisect + อ่านเท่าจำนวนที่แนะนำ ไม่ขึ้นกับขนาดข้อมูล
+    """
+
+    def __init__(self, values: Iterable, word_starts: bool = False):
+        entries: set[tuple[str, str]] = set()
+        for value in values:
+            if value is None or value != value:  # None / NaN
+                continue
+            display = _SPACE_RE.sub(" ", str(value)).strip()
+            key = normalize_text(display)
+            if not key:
+                continue
+            if word_starts:
+                words = key.split(" ")
+                for i in range(len(words)):
+                    entries.add((" ".join(words[i:]), display))
+            else:
+                entries.add((key, display))
+
+        entries_sorted = sorted(entries)
+        self._keys = [k for k, _ in entries_sorted]
+        self._values = [v for _, v in entries_sorted]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def complete(self, prefix: str, limit: int = 8) -> list[str]:
+        """ค่าเดิม (ตัวพิมพ์ตามข้อมูล) ที่ขึ้นต้นด้วย prefix ไม่เกิน limit ตัว เรียงตามตัวอักษร"""
+        prefix = normalize_text(prefix)
+        if not prefix:
+            return []
+
+        out: list[str] = []
+        for i in range(bisect_left(self._keys, prefix), len(self._keys)):
+            if not self._keys[i].startswith(prefix) or len(out) >= limit:
+                break
+            if self._values[i] not in out:
+                out.append(self._values[i])
+        return out
+
+
+# =============================
+# MODEL DROPDOWN CATALOG
+# =============================
+
+class ModelCatalog:
+    """รายการ (Category, Model, Product Name) ไม่ซ้ำ + label dropdown สำเร็จรูป
+
+    สร้างครั้งเดียวต่อเวอร์ชันข้อมูล ผลของ options(category, keyword) ถูกจำไว้
+    แบบ LRU (สูงสุด CACHE_SIZE คู่) ดูจำนวน hit / miss ได้จาก cache_info()
+    """
+
+    CACHE_SIZE = 256
+    ALL_CATEGORIES = "ทั้งหมด"
+
+    def __init__(self, df, text_index: TextIndex):
+        self._text_index = text_index
+
+        cols = {}
+        for col in ("Category", "Model", "Product Name"):
+            if col in df.columns:
+                cols[col] = [
+                    "" if v is None or v != v else str(v).strip()
+                    for v in df[col].tolist()
+                ]
+            else:
+                cols[col] = [""] * len(df)
+
+        entry_ids: dict[tuple[str, str, str], int] = {}
+        triples: list[tuple[str, str, str]] = []
+        row_triple: list[int] = []
+        for cat, model, pname in zip(cols["Category"], cols["Model"], cols["Product Name"]):
+            if not model:
+                row_triple.append(-1)
+                continue
+            key = (cat, model, pname)
+            if key not in entry_ids:
+                entry_ids[key] = len(triples)
+                triples.append(key)
+            row_triple.append(entry_ids[key])
+
+        labels = [" | ".join(p for p in triple if p) for triple in triples]
+        order = sorted(range(len(triples)), key=lambda i: labels[i].lower())
+        rank = {old: new for new, old in enumerate(order)}
+
+        # entry เรียงตาม label แล้ว เลือก subset ด้วย id ที่เรียงก็ได้ลำดับถูกต้องเลย
+        self._options = [(labels[i], triples[i][1]) for i in order]
+        self._categories = [triples[i][0] for i in order]
+        self._entry_of_row = [rank[e] if e >= 0 else -1 for e in row_triple]
+
+        self.options = functools.lru_cache(maxsize=self.CACHE_SIZE)(self._build)
+
+    def __len__(self) -> int:
+        return len(self._options)
+
+    def cache_info(self):
+        return self.options.cache_info()
+
+    def _build(self, category: str = "", keyword: str = "") -> tuple[tuple[str, str], ...]:
+        """(label, model) ที่ตรงกับ category + keyword เรียงตาม label"""
+        if keyword:
+            ids = {self._entry_of_row[pos] for pos in self._text_index.search(keyword)}
+            ids.discard(-1)
+            ids = sorted(ids)
+        else:
+            ids = range(len(self._options))
+
+        if category and category != self.ALL_CATEGORIES:
+            ids = [i for i in ids if self._categories[i] == category]
+
+        return tuple(self._options[i] for i in ids)
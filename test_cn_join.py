@@ -0,0 +1,43 @@
+import pandas as pd
+
+from catalog import join_cn, normalize_key
+
+
+def test_normalize_key():
+    raw = pd.Series(["ｋｄ236-1179", " kd236 -1179 ", 140300130.0, "140300130.00", None, float("nan"), "nan", "None"])
+    assert list(normalize_key(raw)) == ["KD236-1179", "KD236-1179", "140300130", "140300130", "", "", "", ""]
+
+
+def test_normalize_key_keeps_real_decimals():
+    assert list(normalize_key(pd.Series(["1.5", "10.01"]))) == ["1.5", "10.01"]
+
+
+def test_join_cn_matches_normalized_keys():
+    parts = pd.DataFrame({
+        "Model": ["X70", "X70", "X80", "X80"],
+        "Spare Part Code": ["KD236-1179", "140300130", "kd236-1179", "K9"],
+    })
+    cn = pd.DataFrame({
+        "Model": ["x70 ", "X70", "X80", "X80", "X99"],
+        "Spare Part Code": ["ＫＤ236-1179", 140300130.0, "KD236-1179", "KD236-1179", "K1"],
+        "Recommend": ["a", "b", "c", "dup", "orphan"],
+    })
+    merged = join_cn(parts, cn)
+
+    assert len(merged) == len(parts)
+    assert list(merged["Recommend"].astype(object).where(merged["Recommend"].notna(), None)) == ["a", "b", "c", None]
+    assert merged.attrs["cn_join"] == {
+        "parts_rows": 4,
+        "matched_rows": 3,
+        "cn_rows": 4,
+        "cn_unmatched": 1,
+        "cn_duplicate_keys": 1,
+    }
+    assert isinstance(merged["Recommend"].dtype, pd.CategoricalDtype)
+
+
+def test_join_cn_without_model_uses_code_only():
+    parts = pd.DataFrame({"Model": ["X70", "X80"], "Spare Part Code": ["K1", "k1 "]})
+    cn = pd.DataFrame({"Spare Part Code": ["K1"], "Recommend": ["a"]})
+    merged = join_cn(parts, cn)
+    assert list(merged["Recommend"].astype(object)) == ["a", "a"]
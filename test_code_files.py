@@ -0,0 +1,45 @@
+import io
+
+from openpyxl import Workbook
+import pytest
+
+from queries import CODE_FILE_ERRORS, iter_code_file
+
+
+def read_codes(data: bytes, name: str) -> list[str]:
+    return [code for chunk in iter_code_file(io.BytesIO(data), name) for code in chunk]
+
+
+def xlsx_bytes(rows) -> bytes:
+    wb = Workbook()
+    for row in rows:
+        wb.active.append(row)
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize(
+    "data, name",
+    [
+        (b"code\nK1\n", "renamed.xlsx"),                           # CSV ที่เปลี่ยนนามสกุล
+        (xlsx_bytes([["code"], ["K1"]])[:200], "truncated.xlsx"),  # zip ขาดกลางทาง
+        (b"", "empty.xlsx"),
+        (b"", "empty.csv"),
+        (b"code\nK1\nK2,2,3\n", "ragged.csv"),
+        (b"\xff\xfe\x00bad\x80\n", "latin.txt"),
+    ],
+)
+def test_unreadable_files_raise_handled_errors(data, name):
+    with pytest.raises(CODE_FILE_ERRORS):
+        read_codes(data, name)
+
+
+def test_xlsx_uses_code_column_and_skips_header():
+    data = xlsx_bytes([["qty", "Spare Part Code"], [1, "K1"], [2, "K2"]])
+    assert read_codes(data, "codes.xlsx") == ["K1", "K2"]
+
+
+def test_txt_lines_split_like_pasted_text():
+    assert read_codes(b"A, B\nC;D\n\nE\tF\n", "codes.txt") == ["A", "B", "C", "D", "E", "F"]
+    assert read_codes(b"Spare Part Code\nK1\n", "codes.txt") == ["K1"]
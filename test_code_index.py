@@ -0,0 +1,52 @@
+import pytest
+
+from search_index import CodeIndex, NgramIndex
+
+CODES = ["KD236-1179", "kd236-1180", "K1125", "PK-100", "K1125", " pk-1001 "]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return CodeIndex(CODES)
+
+
+def test_exact_ignores_case_and_padding(index):
+    assert index.exact("kd236-1179") == [0]
+    assert index.exact(" K1125 ") == [2, 4]
+    assert index.exact("pk-1001") == [5]
+    assert index.exact("KD236") == []
+
+
+@pytest.mark.parametrize(
+    "query, rows",
+    [
+        ("kd236", [0, 1]),
+        ("36-11", [0, 1]),      # กลางรหัส ยาวกว่า NGRAM
+        ("k", [0, 1, 2, 3, 4, 5]),
+        ("PK-100", [3, 5]),
+        ("-10", [3, 5]),
+        ("k11250", []),
+        ("", []),
+    ],
+)
+def test_partial_matches_substring_scan(index, query, rows):
+    assert index.partial(query) == rows
+    expected = [pos for pos, code in enumerate(CODES) if query and query.lower() in code.strip().lower()]
+    assert rows == expected
+
+
+def test_match_within_only_filters_previous_keys():
+    index = NgramIndex({"abcd": [0], "abce": [1], "xbcd": [2]})
+    previous = index.match(["bc"])
+    assert index.match(["bcd"], within=previous) == index.match(["bcd"])
+    assert index.match(["bcd"], within={0}) == {0}
+    assert index.match(["bc", "a"]) == {0, 1}
+
+
+def test_scored_rows_ranks_exact_above_substring(index):
+    terms = index.query_terms("K1125")
+    scores = index.scored_rows(index.match(terms), terms)
+    assert set(scores) == {2, 4}
+    terms = index.query_terms("pk-100")
+    scores = index.scored_rows(index.match(terms), terms)
+    assert scores[3] > scores[5]
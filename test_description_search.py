@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+
+from catalog import CatalogStore
+import search_index
+from search_index import DESCRIPTION_FIELDS, IncrementalSearch, normalize_description, stem_en
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return CatalogStore(Path(__file__).parent).current()
+
+
+def literal_rows(catalog, term: str) -> list[int]:
+    """แถวที่มี term อยู่ตรงๆ ในคอลัมน์คำอธิบายสักคอลัมน์ (ไม่ผ่าน index)"""
+    df = catalog.df
+    fields = [col for col in DESCRIPTION_FIELDS if col in df.columns]
+    return [
+        pos for pos in range(len(df))
+        if any(
+            isinstance(df[col].iloc[pos], str) and term in normalize_description(df[col].iloc[pos])
+            for col in fields
+        )
+    ]
+
+
+@pytest.mark.parametrize("term", ["spring", "string", "sprin"])
+def test_description_search_matches_literal_text(catalog, term):
+    assert catalog.description_index.search(term) == literal_rows(catalog, term)
+
+
+def test_spring_does_not_match_spray(catalog):
+    rows = catalog.df.iloc[catalog.description_index.search("spring")]
+    assert len(rows)
+    assert not rows["Description (EN)"].fillna("").str.casefold().str.contains("spray").any()
+
+
+def test_incremental_search_while_typing_spring(catalog):
+    session = IncrementalSearch()
+    for i in range(1, len("springs") + 1):
+        query = "springs"[:i]
+        assert session.search(catalog.description_index, query) == catalog.description_index.search(query)
+    assert session.search(catalog.description_index, "sprin") == literal_rows(catalog, "sprin")
+
+
+def test_incremental_narrowing_matches_full_search(catalog, monkeypatch):
+    # catalog จริงเล็กกว่า INCREMENTAL_MIN_KEYS (ค้นเต็มเสมอ) ลด threshold ให้ผ่านทางกรองต่อ
+    monkeypatch.setattr(search_index, "INCREMENTAL_MIN_KEYS", 0)
+    session = IncrementalSearch()
+    for i in range(1, len("springs") + 1):
+        query = "springs"[:i]
+        assert session.search(catalog.description_index, query) == catalog.description_index.search(query)
+    assert session.narrowed == len("springs") - 1
+
+
+def test_plural_query_matches_singular(catalog):
+    assert catalog.description_index.search("hoses") == catalog.description_index.search("hose")
+    assert stem_en("spring") == "spring"
+    assert stem_en("string") == "string"
+    assert stem_en("boxes") == "box"
+    assert stem_en("glass") == "glass"
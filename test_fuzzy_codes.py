@@ -0,0 +1,51 @@
+import pytest
+
+from search_index import FuzzyCodeIndex, edit_distance, fuzzy_key
+
+
+@pytest.mark.parametrize(
+    "a, b, limit, expected",
+    [
+        ("KD2361179", "KD2361179", 0, 0),
+        ("KD2361179", "KD2361197", 1, 1),   # สลับตัวติดกัน = 1
+        ("KD2361179", "KD236179", 1, 1),    # ลบ
+        ("KD2361179", "KD23611791", 1, 1),  # แทรก
+        ("KD2361179", "KD2361188", 1, None),
+        ("KD2361179", "KD2361188", 2, 2),
+        ("KD2361179", "KD23611", 1, None),  # ความยาวต่างเกิน limit
+        ("ABCD", "WXYZ", 2, None),
+        ("", "AB", 2, 2),
+    ],
+)
+def test_edit_distance_bounds(a, b, limit, expected):
+    assert edit_distance(a, b, limit) == expected
+    assert edit_distance(b, a, limit) == expected
+
+
+def test_fuzzy_key_folds_separators_and_confusables():
+    assert fuzzy_key("kd236 1179") == fuzzy_key("KD236-1I79") == "KD2361179"
+    assert fuzzy_key("PO-10") == "P010"
+    assert fuzzy_key(None) == fuzzy_key(float("nan")) == ""
+
+
+@pytest.fixture(scope="module")
+def index():
+    return FuzzyCodeIndex(["KD236-1179", "KD236-1180", "PK-1001", "AB12", "kd236 1179"])
+
+
+def test_matches_within_max_distance(index):
+    found = index.matches("KD236-1197")
+    assert found[0] == (1, ["KD236-1179", "kd236 1179"], [0, 4])
+    assert all(dist <= index.max_distance(fuzzy_key("KD236-1197")) for dist, _, _ in found)
+
+
+def test_short_codes_allow_one_edit(index):
+    assert index.max_distance("PK1001") == 1
+    assert index.max_distance("PK10012") == 2
+    assert [codes for _, codes, _ in index.matches("PK-1010")] == [["PK-1001"]]
+    assert index.matches("PK-1111") == []
+
+
+def test_queries_below_min_length_are_ignored(index):
+    assert index.matches("AB1") == []
+    assert index.matches("AB13") == [(1, ["AB12"], [3])]